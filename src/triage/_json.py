@@ -0,0 +1,116 @@
+"""JSON encoding helpers that use orjson when it is installed."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterator
+
+try:
+    import orjson  # type: ignore
+except ModuleNotFoundError:
+    orjson = None
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_sorted_bytes(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes with sorted keys, for content hashing."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    """Serialize to a compact JSON string without ASCII escaping."""
+    return dumps_bytes(obj).decode("utf-8")
+
+
+def dumps_pretty_bytes(obj: Any) -> bytes:
+    """Serialize to two-space indented UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def dumps_pretty(obj: Any) -> str:
+    """Serialize to a two-space indented JSON string."""
+    return dumps_pretty_bytes(obj).decode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON; errors are ``json.JSONDecodeError`` (orjson's error subclasses it)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def size_bytes(obj: Any) -> int:
+    """Return the compact UTF-8 serialized size of ``obj`` in bytes."""
+    return len(dumps_bytes(obj))
+
+
+def size_chars(obj: Any) -> int:
+    """Return the compact serialized size of ``obj`` in characters."""
+    encoded = dumps_bytes(obj)
+    return len(encoded) if encoded.isascii() else len(encoded.decode("utf-8"))
+
+
+def iter_pretty(obj: Any, max_depth: int = 3) -> Iterator[str]:
+    """Yield ``dumps_pretty(obj)`` in pieces; see :func:`iter_pretty_bytes`."""
+    for chunk in iter_pretty_bytes(obj, max_depth):
+        yield chunk.decode("utf-8")
+
+
+def iter_pretty_bytes(obj: Any, max_depth: int = 3) -> Iterator[bytes]:
+    """Yield ``dumps_pretty_bytes(obj)`` in pieces, one per container member down to ``max_depth``.
+
+    Joining the pieces gives exactly ``dumps_pretty_bytes(obj)``, but writers never hold
+    more than one member's serialized text (e.g. one event) at a time.
+    """
+    yield from _iter_pretty(obj, b"", max_depth)
+
+
+def _iter_pretty(obj: Any, indent: bytes, depth: int) -> Iterator[bytes]:
+    if depth <= 0 or not isinstance(obj, (dict, list)) or not obj:
+        # Serialized JSON never contains raw newlines inside strings, so re-indenting is safe.
+        yield dumps_pretty_bytes(obj).replace(b"\n", b"\n" + indent)
+        return
+
+    inner = indent + b"  "
+    is_dict = isinstance(obj, dict)
+    items = obj.items() if is_dict else enumerate(obj)
+    yield b"{\n" if is_dict else b"[\n"
+    last = len(obj) - 1
+    for position, (key, value) in enumerate(items):
+        yield inner + dumps_bytes(key) + b": " if is_dict else inner
+        yield from _iter_pretty(value, inner, depth - 1)
+        yield b",\n" if position < last else b"\n"
+    yield indent + (b"}" if is_dict else b"]")
+
+
+def iter_compact(obj: Any, max_depth: int = 3) -> Iterator[str]:
+    """Yield ``dumps(obj)`` in pieces; see :func:`iter_compact_bytes`."""
+    for chunk in iter_compact_bytes(obj, max_depth):
+        yield chunk.decode("utf-8")
+
+
+def iter_compact_bytes(obj: Any, max_depth: int = 3) -> Iterator[bytes]:
+    """Yield ``dumps_bytes(obj)`` in pieces, one per container member down to ``max_depth``."""
+    if max_depth <= 0 or not isinstance(obj, (dict, list)) or not obj:
+        yield dumps_bytes(obj)
+        return
+
+    is_dict = isinstance(obj, dict)
+    yield b"{" if is_dict else b"["
+    for position, (key, value) in enumerate(obj.items() if is_dict else enumerate(obj)):
+        if position:
+            yield b","
+        if is_dict:
+            yield dumps_bytes(key) + b":"
+        yield from iter_compact_bytes(value, max_depth - 1)
+    yield b"}" if is_dict else b"]"
@@ -3,39 +3,51 @@
 from __future__ import annotations
 
 import argparse
-import json
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+import hashlib
+from itertools import accumulate
 from pathlib import Path
 import sys
+import threading
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Iterable
 
+from triage import _json
 from triage.config import DEFAULT_MODEL, OLLAMA_HOST
-from triage.llm.evidence_pack import build_evidence_pack
-from triage.llm.ollama_client import OllamaClient
-from triage.llm.repair import repair_llm_synthesis
-from triage.llm.repair_facts import repair_llm_facts
-from triage.llm.synthesis import build_system_prompt, build_user_prompt
-from triage.llm.two_pass import (
-    build_facts_system_prompt,
-    build_facts_user_prompt,
-    build_synthesis_system_prompt,
-    build_synthesis_user_prompt,
-)
 from triage.version import __version__
-from triage.normalize import NormalizedLine, load_and_normalize, normalization_stats
+from triage.normalize import iter_normalized
 from triage.output import apply_output_mode, extract_evidence_records
-from triage.phases import build_segments, detect_phases
-from triage.rules.engine import compile_rules, run_rules
-from triage.rules.loader import load_rulepack
-from triage.schemas.validate import validate_output
-from triage.signals.progress import Marker, extract_markers
-from triage.signals.stalls import detect_stalls
+from triage.phases import PhaseSpan, Segment
+from triage.pipeline import scan_once
+from triage.signals.progress import Marker
 from triage.signals.enrich_events import enrich_events
 
+if TYPE_CHECKING:
+    from triage.rules.engine import Rule
+
+# LLM, rule-engine, schema and thread-pool modules are imported lazily in the branches
+# that use them, so --version, --no-rules, --no-validate and single-input runs do not
+# pay for their imports.
+
 _DEFAULT_RULEPACK = Path(__file__).resolve().parent / "rulepacks" / "faults_v1.yaml"
 _MRC_RULEPACK = Path(__file__).resolve().parent / "rulepacks" / "mrc_v1.yaml"
 _PCIE_RULEPACK = Path(__file__).resolve().parent / "rulepacks" / "pcie_v1.yaml"
 _STORAGE_RULEPACK = Path(__file__).resolve().parent / "rulepacks" / "storage_v1.yaml"
+_PRESET_RULEPACKS: dict[str, tuple[str, ...]] = {
+    "faults": (str(_DEFAULT_RULEPACK),),
+    "mrc": (str(_MRC_RULEPACK),),
+    "pcie": (str(_PCIE_RULEPACK),),
+    "storage": (str(_STORAGE_RULEPACK),),
+    "all": (str(_DEFAULT_RULEPACK), str(_MRC_RULEPACK), str(_PCIE_RULEPACK), str(_STORAGE_RULEPACK)),
+}
 _SEVERITY_SCORES = {"fatal": 100, "high": 60, "medium": 30, "low": 10, "info": 1}
 _PHASE_PENALTIES = {"SEC": 0, "PEI": 2, "DXE": 4, "BDS": 6}
+_JSONL_BUFFER_BYTES = 1 << 20
+_JSONL_BATCH_RECORDS = 1024
+# Shared read-only stand-in for missing sub-dicts, so lookups never allocate one.
+_EMPTY: MappingProxyType = MappingProxyType({})
 
 def _marker_milestone(marker: Marker) -> dict[str, str | int]:
     return {
@@ -45,10 +57,61 @@ def _marker_milestone(marker: Marker) -> dict[str, str | int]:
     }
 
 
+def _last_marker_per_segment(segments: list[Segment], markers: list[Marker]) -> list[Marker | None]:
+    """Return the last marker inside each segment using one merge sweep (O(S + M))."""
+    if any(prev["idx"] > current["idx"] for prev, current in zip(markers, markers[1:])):
+        markers = sorted(markers, key=lambda marker: marker["idx"])
+
+    last_markers: list[Marker | None] = []
+    position = 0
+    for segment in segments:
+        while position < len(markers) and markers[position]["idx"] < segment.start_line:
+            position += 1
+        last_marker: Marker | None = None
+        while position < len(markers) and markers[position]["idx"] <= segment.end_line:
+            last_marker = markers[position]
+            position += 1
+        last_markers.append(last_marker)
+    return last_markers
+
+
+def _phase_payload(phase: PhaseSpan) -> dict[str, object]:
+    return {
+        "phase": phase.phase,
+        "start_line": phase.start_line,
+        "end_line": phase.end_line,
+        "confidence": phase.confidence,
+    }
+
+
+def _segment_payload(segment: Segment, last_marker: Marker | None) -> dict[str, object]:
+    """Build the boot_timeline entry for one segment."""
+    segment_payload: dict[str, object] = {
+        "segment_id": segment.segment_id,
+        "start_line": segment.start_line,
+        "end_line": segment.end_line,
+        "phases": list(map(_phase_payload, segment.phases)),
+    }
+    if last_marker is not None:
+        segment_payload["last_good_milestone"] = _marker_milestone(last_marker)
+    return segment_payload
+
+
 def build_parser() -> argparse.ArgumentParser:
     """Build CLI argument parser."""
     parser = argparse.ArgumentParser(prog="bioslogtriage")
-    parser.add_argument("--input", required=False, help="Path to log file to triage")
+    parser.add_argument(
+        "--input",
+        nargs="+",
+        required=False,
+        help="Path to log file to triage. Pass several paths to triage them concurrently.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="Max log files processed concurrently when several --input paths are given (default: 4)",
+    )
     parser.add_argument("--llm", action="store_true", help="Enable local Ollama call")
     parser.add_argument("--ollama-host", default=OLLAMA_HOST, help="Ollama host URL")
     parser.add_argument("--model", default=DEFAULT_MODEL, help="Ollama model name")
@@ -68,7 +131,7 @@ def build_parser() -> argparse.ArgumentParser:
         "--llm-facts-max-chars",
         type=int,
         default=8000,
-        help="Max serialized character budget for pass2 llm_facts prompt payload (default: 8000)",
+        help="Max serialized size in UTF-8 bytes for pass2 llm_facts prompt payload (default: 8000)",
     )
     parser.add_argument(
         "--llm-two-pass",
@@ -89,6 +152,11 @@ def build_parser() -> argparse.ArgumentParser:
         default=300,
         help="Timeout in seconds for Ollama generate requests (default: 300)",
     )
+    parser.add_argument(
+        "--llm-keep-alive",
+        default="10m",
+        help="How long Ollama keeps the model loaded after a request, e.g. 10m or 0 (default: 10m)",
+    )
     parser.add_argument(
         "--dump-llm-prompt",
         default=None,
@@ -107,10 +175,24 @@ def build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "--rulepack",
-        choices=("faults", "mrc", "pcie", "storage", "all"),
+        choices=tuple(_PRESET_RULEPACKS),
         default="all",
         help="Built-in rulepack preset (default: all)",
     )
+    parser.add_argument(
+        "--rules-engine",
+        choices=("combined", "python"),
+        default="combined",
+        help="Rule matcher: 'combined' only runs rules whose required literals appear in the line; "
+        "'python' runs every rule regex on every line (default: combined)",
+    )
+    parser.add_argument(
+        "--rule-workers",
+        type=int,
+        default=1,
+        help="Worker processes used to match rules on a large log; ignored when several "
+        "--input paths are given (default: 1, in-process)",
+    )
     parser.add_argument(
         "--no-rules",
         action="store_true",
@@ -138,75 +220,88 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Optional path to write output JSON; defaults to stdout",
     )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write compact single-line JSON instead of indented output",
+    )
     parser.add_argument(
         "--evidence-out",
         default=None,
         help="Optional path to write per-evidence JSONL artifact records",
     )
 
-    validation_group = parser.add_mutually_exclusive_group()
-    validation_group.add_argument(
+    parser.add_argument(
         "--validate",
-        dest="validate",
-        action="store_true",
+        action=argparse.BooleanOptionalAction,
         default=True,
-        help="Validate JSON output against Schema v0 (default: enabled)",
-    )
-    validation_group.add_argument(
-        "--no-validate",
-        dest="validate",
-        action="store_false",
-        help="Disable schema validation",
+        help="Validate JSON output against Schema v0; --no-validate disables it",
     )
     return parser
 
 
-def _boot_blocking_score(event: dict) -> int:
-    severity_score = _SEVERITY_SCORES.get(str(event.get("severity", "")).lower(), 0)
-    confidence = float(event.get("confidence", 0.0))
-    phase = event.get("where", {}).get("phase")
-    phase_penalty = _PHASE_PENALTIES.get(phase, 0)
-    return severity_score + round(confidence * 20) - phase_penalty
+@lru_cache(maxsize=1)
+def _shared_parser() -> argparse.ArgumentParser:
+    # parse_args does not mutate the parser, so repeated main() calls in one
+    # process (tests, batch wrappers) can reuse a single instance.
+    return build_parser()
+
+
+def _boot_blocking_score(severity: object, confidence: float, phase: object) -> int:
+    return _SEVERITY_SCORES.get(severity, 0) + round(confidence * 20) - _PHASE_PENALTIES.get(phase, 0)
 
 
 def _select_boot_blocking_event_id(events: list[dict]) -> str | None:
-    blocking = [event for event in events if event.get("boot_blocking")]
-    if not blocking:
+    # Severities are lower-cased by compile_rules, so no per-event normalization is needed.
+    # Keep only the running best (score, -start, -position) key instead of a candidate list.
+    best: tuple[int, int, int] | None = None
+    for position, event in enumerate(events):
+        if not event.get("boot_blocking"):
+            continue
+        where = event.get("where") or _EMPTY
+        line_range = where.get("line_range") or _EMPTY
+        score = _boot_blocking_score(
+            event.get("severity"),
+            float(event.get("confidence", 0.0)),
+            where.get("phase"),
+        )
+        key = (score, -int(line_range.get("start", 10**9)), -position)
+        if best is None or key > best:
+            best = key
+
+    if best is None:
         return None
+    return events[-best[2]].get("event_id")
 
-    selected = max(
-        blocking,
-        key=lambda event: (
-            _boot_blocking_score(event),
-            -int(event.get("where", {}).get("line_range", {}).get("start", 10**9)),
-        ),
-    )
-    return selected.get("event_id")
 
+def _select_best_llm_event_id(output: dict, boot_blocking_event_id: str | None = None) -> str:
+    # Callers that already selected the boot-blocking event pass it in directly,
+    # skipping the walk back through output["boot_timeline"].
+    if boot_blocking_event_id:
+        return boot_blocking_event_id
 
-def _select_best_llm_event_id(output: dict) -> str:
     boot_timeline = output.get("boot_timeline")
-    if isinstance(boot_timeline, dict):
+    if type(boot_timeline) is dict:
         boot_blocking_event_id = boot_timeline.get("boot_blocking_event_id")
-        if isinstance(boot_blocking_event_id, str) and boot_blocking_event_id:
+        if type(boot_blocking_event_id) is str and boot_blocking_event_id:
             return boot_blocking_event_id
 
     llm_input = output.get("llm_input")
-    if isinstance(llm_input, dict):
+    if type(llm_input) is dict:
         selected_events = llm_input.get("selected_events")
-        if isinstance(selected_events, list) and selected_events:
+        if type(selected_events) is list and selected_events:
             first = selected_events[0]
-            if isinstance(first, dict):
+            if type(first) is dict:
                 event_id = first.get("event_id")
-                if isinstance(event_id, str) and event_id:
+                if type(event_id) is str and event_id:
                     return event_id
 
     events = output.get("events")
-    if isinstance(events, list) and events:
+    if type(events) is list and events:
         first = events[0]
-        if isinstance(first, dict):
+        if type(first) is dict:
             event_id = first.get("event_id")
-            if isinstance(event_id, str) and event_id:
+            if type(event_id) is str and event_id:
                 return event_id
 
     return "evt-0"
@@ -269,228 +364,308 @@ def _llm_facts_fallback(
     }
 
 
-def _validate_llm_facts(llm_facts: dict) -> None:
-    schema = {
-        "type": "object",
-        "additionalProperties": False,
-        "required": ["overall_grounding_confidence", "facts"],
-        "properties": {
-            "overall_grounding_confidence": {"type": "number", "minimum": 0, "maximum": 1},
-            "facts": {
-                "type": "array",
-                "minItems": 0,
-                "maxItems": 60,
-                "items": {
-                    "type": "object",
-                    "additionalProperties": False,
-                    "required": ["fact", "supporting_event_ids", "confidence"],
-                    "properties": {
-                        "fact": {"type": "string", "minLength": 1, "maxLength": 300},
-                        "supporting_event_ids": {
-                            "type": "array",
-                            "minItems": 1,
-                            "items": {"type": "string"},
-                        },
-                        "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+def _trim_llm_facts_to_budget(llm_facts: dict, budget: int) -> dict:
+    """Keep the longest prefix of facts whose compact serialization fits ``budget`` bytes."""
+    trimmed = {
+        "overall_grounding_confidence": llm_facts.get("overall_grounding_confidence", 0.0),
+        "facts": [],
+    }
+    facts = llm_facts.get("facts", [])
+    base_size = _json.size_bytes(trimmed)
+    # Size of k facts inside the array is sum(fact sizes) + (k - 1) commas; folding one
+    # separator into each fact gives a monotonic cost that bisect can search.
+    costs = list(accumulate(_json.size_bytes(fact) + 1 for fact in facts))
+    keep = bisect_right(costs, budget - base_size + 1)
+    trimmed["facts"] = [dict(fact) for fact in facts[:keep]]
+    return trimmed
+
+
+_LLM_FACTS_SCHEMA: dict = {
+    "type": "object",
+    "additionalProperties": False,
+    "required": ["overall_grounding_confidence", "facts"],
+    "properties": {
+        "overall_grounding_confidence": {"type": "number", "minimum": 0, "maximum": 1},
+        "facts": {
+            "type": "array",
+            "minItems": 0,
+            "maxItems": 60,
+            "items": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": ["fact", "supporting_event_ids", "confidence"],
+                "properties": {
+                    "fact": {"type": "string", "minLength": 1, "maxLength": 300},
+                    "supporting_event_ids": {
+                        "type": "array",
+                        "minItems": 1,
+                        "items": {"type": "string"},
                     },
+                    "confidence": {"type": "number", "minimum": 0, "maximum": 1},
                 },
             },
-            "errors": {
-                "type": "array",
-                "items": {"type": "object", "additionalProperties": True},
-            },
         },
-    }
-
-    try:
-        import jsonschema
-    except ModuleNotFoundError:
-        required = {"overall_grounding_confidence", "facts"}
-        missing = required - set(llm_facts.keys())
-        if missing:
-            raise ValueError(f"missing required keys {sorted(missing)}")
-        return
-
-    validator = jsonschema.Draft202012Validator(schema)
-    errors = sorted(validator.iter_errors(llm_facts), key=lambda err: list(err.path))
-    if errors:
-        first = errors[0]
-        path = ".".join(str(part) for part in first.path) or "<root>"
-        raise ValueError(f"llm_facts validation failed at {path}: {first.message}")
-
-
-def _validate_llm_synthesis(llm_synthesis: dict) -> None:
-    schema = {
-        "type": "object",
-        "additionalProperties": False,
-        "required": [
-            "overall_confidence",
-            "executive_summary",
-            "root_cause_hypotheses",
-            "recommended_next_actions",
-            "missing_evidence",
-        ],
-        "properties": {
-            "model_info": {"type": "object", "additionalProperties": True},
-            "overall_confidence": {"type": "number", "minimum": 0, "maximum": 1},
-            "executive_summary": {"type": "string", "minLength": 1, "maxLength": 2000},
-            "root_cause_hypotheses": {
-                "type": "array",
-                "maxItems": 5,
-                "items": {
-                    "type": "object",
-                    "additionalProperties": False,
-                    "required": [
-                        "title",
-                        "confidence",
-                        "supporting_event_ids",
-                        "reasoning",
-                        "next_actions",
-                    ],
-                    "properties": {
-                        "title": {"type": "string", "minLength": 1, "maxLength": 200},
-                        "confidence": {"type": "number", "minimum": 0, "maximum": 1},
-                        "supporting_event_ids": {
-                            "type": "array",
-                            "minItems": 1,
-                            "items": {"type": "string"},
-                        },
-                        "reasoning": {"type": "string", "minLength": 1, "maxLength": 2000},
-                        "next_actions": {
-                            "type": "array",
-                            "maxItems": 8,
-                            "items": {
-                                "type": "object",
-                                "additionalProperties": False,
-                                "required": [
-                                    "action",
-                                    "priority",
-                                    "expected_signal",
-                                    "supporting_event_ids",
-                                ],
-                                "properties": {
-                                    "action": {"type": "string", "minLength": 1, "maxLength": 300},
-                                    "priority": {"type": "string", "enum": ["P0", "P1", "P2"]},
-                                    "expected_signal": {
-                                        "type": "string",
-                                        "minLength": 1,
-                                        "maxLength": 300,
-                                    },
-                                    "supporting_event_ids": {
-                                        "type": "array",
-                                        "minItems": 1,
-                                        "items": {"type": "string"},
-                                    },
+        "errors": {
+            "type": "array",
+            "items": {"type": "object", "additionalProperties": True},
+        },
+    },
+}
+
+_LLM_SYNTHESIS_SCHEMA: dict = {
+    "type": "object",
+    "additionalProperties": False,
+    "required": [
+        "overall_confidence",
+        "executive_summary",
+        "root_cause_hypotheses",
+        "recommended_next_actions",
+        "missing_evidence",
+    ],
+    "properties": {
+        "model_info": {"type": "object", "additionalProperties": True},
+        "overall_confidence": {"type": "number", "minimum": 0, "maximum": 1},
+        "executive_summary": {"type": "string", "minLength": 1, "maxLength": 2000},
+        "root_cause_hypotheses": {
+            "type": "array",
+            "maxItems": 5,
+            "items": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": [
+                    "title",
+                    "confidence",
+                    "supporting_event_ids",
+                    "reasoning",
+                    "next_actions",
+                ],
+                "properties": {
+                    "title": {"type": "string", "minLength": 1, "maxLength": 200},
+                    "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+                    "supporting_event_ids": {
+                        "type": "array",
+                        "minItems": 1,
+                        "items": {"type": "string"},
+                    },
+                    "reasoning": {"type": "string", "minLength": 1, "maxLength": 2000},
+                    "next_actions": {
+                        "type": "array",
+                        "maxItems": 8,
+                        "items": {
+                            "type": "object",
+                            "additionalProperties": False,
+                            "required": [
+                                "action",
+                                "priority",
+                                "expected_signal",
+                                "supporting_event_ids",
+                            ],
+                            "properties": {
+                                "action": {"type": "string", "minLength": 1, "maxLength": 300},
+                                "priority": {"type": "string", "enum": ["P0", "P1", "P2"]},
+                                "expected_signal": {
+                                    "type": "string",
+                                    "minLength": 1,
+                                    "maxLength": 300,
+                                },
+                                "supporting_event_ids": {
+                                    "type": "array",
+                                    "minItems": 1,
+                                    "items": {"type": "string"},
                                 },
                             },
                         },
                     },
                 },
             },
-            "recommended_next_actions": {
-                "type": "array",
-                "maxItems": 10,
-                "items": {
-                    "type": "object",
-                    "additionalProperties": False,
-                    "required": ["action", "priority", "expected_signal", "supporting_event_ids"],
-                    "properties": {
-                        "action": {"type": "string", "minLength": 1, "maxLength": 300},
-                        "priority": {"type": "string", "enum": ["P0", "P1", "P2"]},
-                        "expected_signal": {"type": "string", "minLength": 1, "maxLength": 300},
-                        "supporting_event_ids": {
-                            "type": "array",
-                            "minItems": 1,
-                            "items": {"type": "string"},
-                        },
+        },
+        "recommended_next_actions": {
+            "type": "array",
+            "maxItems": 10,
+            "items": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": ["action", "priority", "expected_signal", "supporting_event_ids"],
+                "properties": {
+                    "action": {"type": "string", "minLength": 1, "maxLength": 300},
+                    "priority": {"type": "string", "enum": ["P0", "P1", "P2"]},
+                    "expected_signal": {"type": "string", "minLength": 1, "maxLength": 300},
+                    "supporting_event_ids": {
+                        "type": "array",
+                        "minItems": 1,
+                        "items": {"type": "string"},
                     },
                 },
             },
-            "missing_evidence": {
-                "type": "array",
-                "maxItems": 10,
-                "items": {
-                    "type": "object",
-                    "additionalProperties": False,
-                    "required": ["need", "why", "how", "priority", "supporting_event_ids"],
-                    "properties": {
-                        "need": {"type": "string", "minLength": 1, "maxLength": 200},
-                        "why": {"type": "string", "minLength": 1, "maxLength": 300},
-                        "how": {"type": "string", "minLength": 1, "maxLength": 300},
-                        "priority": {"type": "string", "enum": ["high", "medium", "low"]},
-                        "supporting_event_ids": {
-                            "type": "array",
-                            "minItems": 1,
-                            "items": {"type": "string"},
-                        },
+        },
+        "missing_evidence": {
+            "type": "array",
+            "maxItems": 10,
+            "items": {
+                "type": "object",
+                "additionalProperties": False,
+                "required": ["need", "why", "how", "priority", "supporting_event_ids"],
+                "properties": {
+                    "need": {"type": "string", "minLength": 1, "maxLength": 200},
+                    "why": {"type": "string", "minLength": 1, "maxLength": 300},
+                    "how": {"type": "string", "minLength": 1, "maxLength": 300},
+                    "priority": {"type": "string", "enum": ["high", "medium", "low"]},
+                    "supporting_event_ids": {
+                        "type": "array",
+                        "minItems": 1,
+                        "items": {"type": "string"},
                     },
                 },
             },
-            "errors": {
-                "type": "array",
-                "items": {"type": "object", "additionalProperties": True},
-            },
         },
-    }
+        "errors": {
+            "type": "array",
+            "items": {"type": "object", "additionalProperties": True},
+        },
+    },
+}
+
+
+_LLM_SCHEMAS = {"llm_facts": _LLM_FACTS_SCHEMA, "llm_synthesis": _LLM_SYNTHESIS_SCHEMA}
 
+
+@lru_cache(maxsize=None)
+def _compiled_llm_validator(schema_name: str) -> Callable[[dict], object] | None:
+    """Compile an LLM payload schema to Python code once, when fastjsonschema is installed."""
+    try:
+        import fastjsonschema
+    except ModuleNotFoundError:
+        return None
+    return fastjsonschema.compile(_LLM_SCHEMAS[schema_name])
+
+
+@lru_cache(maxsize=None)
+def _jsonschema_llm_validator(schema_name: str) -> Any | None:
+    """Build the reference jsonschema validator for an LLM payload schema once."""
     try:
         import jsonschema
     except ModuleNotFoundError:
-        required = {
-            "overall_confidence",
-            "executive_summary",
-            "root_cause_hypotheses",
-            "recommended_next_actions",
-            "missing_evidence",
-        }
-        missing = required - set(llm_synthesis.keys())
+        return None
+    return jsonschema.Draft202012Validator(_LLM_SCHEMAS[schema_name])
+
+
+_VALIDATED_LLM_PAYLOADS: OrderedDict[bytes, None] = OrderedDict()
+_VALIDATED_LLM_PAYLOADS_MAX = 64
+_VALIDATED_LLM_PAYLOADS_LOCK = threading.Lock()
+
+
+def _validate_llm_payload(payload: dict, schema: dict, label: str) -> None:
+    """Validate an LLM payload, skipping content already validated in this process."""
+    try:
+        digest = hashlib.blake2b(
+            _json.dumps_sorted_bytes(payload),
+            digest_size=16,
+            person=label.encode("utf-8")[:16],
+        ).digest()
+    except TypeError:
+        digest = None
+
+    if digest is not None:
+        with _VALIDATED_LLM_PAYLOADS_LOCK:
+            if digest in _VALIDATED_LLM_PAYLOADS:
+                _VALIDATED_LLM_PAYLOADS.move_to_end(digest)
+                return
+
+    _check_llm_payload(payload, schema, label)
+
+    if digest is not None:
+        with _VALIDATED_LLM_PAYLOADS_LOCK:
+            _VALIDATED_LLM_PAYLOADS[digest] = None
+            if len(_VALIDATED_LLM_PAYLOADS) > _VALIDATED_LLM_PAYLOADS_MAX:
+                _VALIDATED_LLM_PAYLOADS.popitem(last=False)
+
+
+def _check_llm_payload(payload: dict, schema: dict, label: str) -> None:
+    compiled = _compiled_llm_validator(label)
+    if compiled is not None:
+        import fastjsonschema
+
+        try:
+            compiled(payload)
+        except fastjsonschema.JsonSchemaValueException as exc:
+            parts = [str(part) for part in (exc.path or [])[1:]]
+            path = ".".join(parts) or "<root>"
+            raise ValueError(f"{label} validation failed at {path}: {exc.message}") from exc
+        return
+
+    validator = _jsonschema_llm_validator(label)
+    if validator is None:
+        missing = set(schema["required"]) - set(payload.keys())
         if missing:
             raise ValueError(f"missing required keys {sorted(missing)}")
         return
 
-    validator = jsonschema.Draft202012Validator(schema)
-    errors = sorted(validator.iter_errors(llm_synthesis), key=lambda err: list(err.path))
+    errors = sorted(validator.iter_errors(payload), key=lambda err: list(err.path))
     if errors:
         first = errors[0]
         path = ".".join(str(part) for part in first.path) or "<root>"
-        raise ValueError(f"llm_synthesis validation failed at {path}: {first.message}")
+        raise ValueError(f"{label} validation failed at {path}: {first.message}")
 
-def main(argv: list[str] | None = None) -> int:
-    """Entrypoint for the triage CLI."""
-    args = build_parser().parse_args(argv)
 
-    if args.version:
-        print(__version__)
-        return 0
+def _validate_llm_facts(llm_facts: dict) -> None:
+    _validate_llm_payload(llm_facts, _LLM_FACTS_SCHEMA, "llm_facts")
 
-    if not args.input:
-        print("--input is required unless --version is provided", file=sys.stderr)
-        return 2
 
-    lines = load_and_normalize(args.input)
-    phases = detect_phases(lines)
-    segments = build_segments(lines, phases)
+def _validate_llm_synthesis(llm_synthesis: dict) -> None:
+    _validate_llm_payload(llm_synthesis, _LLM_SYNTHESIS_SCHEMA, "llm_synthesis")
 
-    markers = extract_markers(lines)
 
-    events: list[dict] = []
-    if not args.no_rules:
-        if args.rules:
-            rulepack_paths = args.rules
-        else:
-            preset_map = {
-                "faults": [str(_DEFAULT_RULEPACK)],
-                "mrc": [str(_MRC_RULEPACK)],
-                "pcie": [str(_PCIE_RULEPACK)],
-                "storage": [str(_STORAGE_RULEPACK)],
-                "all": [str(_DEFAULT_RULEPACK), str(_MRC_RULEPACK), str(_PCIE_RULEPACK), str(_STORAGE_RULEPACK)],
-            }
-            rulepack_paths = preset_map[args.rulepack]
+def _write_jsonl(path: Path, records: list[dict]) -> None:
+    """Write JSONL records in batches through a large binary buffer."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb", buffering=_JSONL_BUFFER_BYTES) as handle:
+        for start in range(0, len(records), _JSONL_BATCH_RECORDS):
+            batch = records[start : start + _JSONL_BATCH_RECORDS]
+            handle.write(b"".join(_json.dumps_bytes(record) + b"\n" for record in batch))
+
+
+def _write_stdout_bytes(chunks: Iterable[bytes]) -> None:
+    """Write encoded JSON chunks to stdout, bypassing the text layer when possible."""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.writelines(chunk.decode("utf-8") for chunk in chunks)
+        sys.stdout.write("\n")
+        return
+    sys.stdout.flush()
+    buffer.writelines(chunks)
+    buffer.write(b"\n")
+    buffer.flush()
 
-        rules = []
-        for rulepack_path in rulepack_paths:
-            rulepack = load_rulepack(rulepack_path)
-            rules.extend(compile_rules(rulepack))
+
+def _resolve_rulepack_paths(args: argparse.Namespace) -> list[str]:
+    if args.rules:
+        return args.rules
+    return list(_PRESET_RULEPACKS[args.rulepack])
+
+
+def _prompt_dump_path(dump_path: str, index: int, total: int) -> Path:
+    """Return a per-input prompt dump path so concurrent inputs never share a file."""
+    path = Path(dump_path)
+    if total <= 1:
+        return path
+    return path.with_name(f"{path.stem}.{index + 1}{path.suffix}")
+
+
+def _triage_input(
+    input_path: str,
+    args: argparse.Namespace,
+    rules: list[Rule] | None,
+    dump_llm_prompt: Path | None = None,
+) -> dict:
+    """Run deterministic triage (and optional LLM synthesis) for a single log file."""
+    scan = scan_once(iter_normalized(input_path))
+    lines = scan.lines
+    segments = scan.segments
+    markers = scan.markers
+
+    events: list[dict] = []
+    if rules is not None:
+        from triage.rules.engine import run_rules
 
         events = run_rules(
             lines,
@@ -498,49 +673,30 @@ def main(argv: list[str] | None = None) -> int:
             rules,
             context_lines=max(0, args.context_lines),
             include_evidence_lines=(not args.no_evidence),
+            use_prefilter=(args.rules_engine == "combined"),
+            workers=args.rule_workers,
         )
 
-    boot_timeline_segments: list[dict[str, object]] = []
-    for segment in segments:
-        segment_markers = [
-            marker
-            for marker in markers
-            if segment.start_line <= marker["idx"] <= segment.end_line
-        ]
-        segment_payload: dict[str, object] = {
-            "segment_id": segment.segment_id,
-            "start_line": segment.start_line,
-            "end_line": segment.end_line,
-            "phases": [
-                {
-                    "phase": phase.phase,
-                    "start_line": phase.start_line,
-                    "end_line": phase.end_line,
-                    "confidence": phase.confidence,
-                }
-                for phase in segment.phases
-            ],
-        }
-        if segment_markers:
-            segment_payload["last_good_milestone"] = _marker_milestone(segment_markers[-1])
-        boot_timeline_segments.append(segment_payload)
+    boot_timeline_segments = list(
+        map(_segment_payload, segments, _last_marker_per_segment(segments, markers))
+    )
 
+    boot_blocking_event_id = _select_boot_blocking_event_id(events)
     boot_timeline: dict[str, object] = {
         "segments": boot_timeline_segments,
         "boot_outcome": "unknown",
-        "boot_blocking_event_id": _select_boot_blocking_event_id(events),
+        "boot_blocking_event_id": boot_blocking_event_id,
     }
 
     output_signals: dict[str, object] = {}
-    stalls = detect_stalls(markers, phases)
-    output_signals["stalls"] = stalls
+    output_signals["stalls"] = scan.stalls
 
     if events:
         enrich_events(events, markers, lines, boot_timeline["boot_blocking_event_id"])
 
     output = {
         "schema_version": "0.1.0",
-        "normalization": normalization_stats(lines),
+        "normalization": scan.normalization,
         "events": events,
         "llm_enabled": args.llm,
         "boot_timeline": boot_timeline,
@@ -548,7 +704,18 @@ def main(argv: list[str] | None = None) -> int:
     output["signals"] = output_signals
 
     if args.llm:
-        llm_ok = False
+        from triage.llm.evidence_pack import build_evidence_pack
+        from triage.llm.ollama_client import OllamaClient
+        from triage.llm.repair import repair_llm_synthesis
+        from triage.llm.repair_facts import repair_llm_facts
+        from triage.llm.synthesis import build_system_prompt, build_user_prompt
+        from triage.llm.two_pass import (
+            build_facts_system_prompt,
+            build_facts_user_prompt,
+            build_synthesis_system_prompt,
+            build_synthesis_user_prompt,
+        )
+
         model_name = args.model
         timeout_s = max(1, args.llm_timeout_s)
         prompt_len = 0
@@ -561,15 +728,19 @@ def main(argv: list[str] | None = None) -> int:
             )
             output["llm_input"] = evidence_pack
 
-            client = OllamaClient(host=args.ollama_host, model=model_name, timeout_s=timeout_s)
+            client = OllamaClient(
+                host=args.ollama_host,
+                model=model_name,
+                timeout_s=timeout_s,
+                keep_alive=args.llm_keep_alive,
+            )
 
             if args.llm_two_pass:
                 facts_prompt = build_facts_user_prompt(evidence_pack)
                 prompt_len = len(facts_prompt)
-                if args.dump_llm_prompt:
-                    Path(args.dump_llm_prompt).write_text(
-                        f"# PASS1 FACTS\n{facts_prompt}\n", encoding="utf-8"
-                    )
+                if dump_llm_prompt:
+                    with dump_llm_prompt.open("w", encoding="utf-8") as handle:
+                        handle.write(f"# PASS1 FACTS\n{facts_prompt}\n")
 
                 facts_candidate = client.generate_json(
                     system=build_facts_system_prompt(),
@@ -596,34 +767,22 @@ def main(argv: list[str] | None = None) -> int:
                     )
                 output["llm_facts"] = llm_facts
 
-                facts_json = json.dumps(llm_facts, ensure_ascii=False, separators=(",", ":"))
                 facts_budget = max(1, args.llm_facts_max_chars)
-                if len(facts_json) > facts_budget:
-                    llm_facts_for_prompt = {
-                        "overall_grounding_confidence": llm_facts.get("overall_grounding_confidence", 0.0),
-                        "facts": [],
-                    }
-                    for fact in llm_facts.get("facts", []):
-                        candidate_fact = dict(fact)
-                        next_facts = [*llm_facts_for_prompt["facts"], candidate_fact]
-                        candidate_payload = {
-                            "overall_grounding_confidence": llm_facts_for_prompt["overall_grounding_confidence"],
-                            "facts": next_facts,
-                        }
-                        if len(json.dumps(candidate_payload, ensure_ascii=False, separators=(",", ":"))) > facts_budget:
-                            break
-                        llm_facts_for_prompt["facts"] = next_facts
+                facts_bytes = _json.dumps_bytes(llm_facts)
+                if len(facts_bytes) > facts_budget:
+                    llm_facts_for_prompt = _trim_llm_facts_to_budget(llm_facts, facts_budget)
+                    facts_bytes = _json.dumps_bytes(llm_facts_for_prompt)
                 else:
                     llm_facts_for_prompt = llm_facts
 
-                synthesis_prompt = build_synthesis_user_prompt(llm_facts_for_prompt)
+                synthesis_prompt = build_synthesis_user_prompt(
+                    llm_facts_for_prompt,
+                    serialized=facts_bytes.decode("utf-8"),
+                )
                 prompt_len = len(synthesis_prompt)
-                if args.dump_llm_prompt:
-                    Path(args.dump_llm_prompt).write_text(
-                        Path(args.dump_llm_prompt).read_text(encoding="utf-8")
-                        + f"# PASS2 SYNTHESIS\n{synthesis_prompt}\n",
-                        encoding="utf-8",
-                    )
+                if dump_llm_prompt:
+                    with dump_llm_prompt.open("a", encoding="utf-8") as handle:
+                        handle.write(f"# PASS2 SYNTHESIS\n{synthesis_prompt}\n")
 
                 candidate = client.generate_json(
                     system=build_synthesis_system_prompt(),
@@ -633,8 +792,8 @@ def main(argv: list[str] | None = None) -> int:
             else:
                 user_prompt = build_user_prompt(evidence_pack)
                 prompt_len = len(user_prompt)
-                if args.dump_llm_prompt:
-                    Path(args.dump_llm_prompt).write_text(user_prompt, encoding="utf-8")
+                if dump_llm_prompt:
+                    dump_llm_prompt.write_text(user_prompt, encoding="utf-8")
 
                 candidate = client.generate_json(
                     system=build_system_prompt(),
@@ -650,10 +809,15 @@ def main(argv: list[str] | None = None) -> int:
                 candidate_keys = sorted(candidate.keys())
             if "evidence_pack" in candidate or "selected_events" in candidate:
                 raise ValueError("LLM echoed input evidence pack instead of producing llm_synthesis")
-            candidate = repair_llm_synthesis(candidate, best_event_id=_select_best_llm_event_id(output))
+            candidate = repair_llm_synthesis(
+                candidate,
+                best_event_id=_select_best_llm_event_id(
+                    output,
+                    boot_blocking_event_id=boot_blocking_event_id,
+                ),
+            )
             _validate_llm_synthesis(candidate)
             output["llm_synthesis"] = candidate
-            llm_ok = True
         except Exception as exc:  # noqa: BLE001
             output["llm_synthesis"] = _llm_fallback(
                 error_type=exc.__class__.__name__,
@@ -665,46 +829,90 @@ def main(argv: list[str] | None = None) -> int:
                 candidate_keys=candidate_keys,
             )
 
-        if not llm_ok:
-            output["llm_synthesis"] = output.get(
-                "llm_synthesis",
-                _llm_fallback(
-                    error_type="RuntimeError",
-                    message="Failed to generate or validate LLM synthesis",
-                    detail="LLM synthesis status unknown",
-                    model=model_name,
-                    timeout_s=timeout_s,
-                    prompt_len=prompt_len,
-                    candidate_keys=candidate_keys,
-                ),
+    return output
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entrypoint for the triage CLI."""
+    # Scripts that poll the version should not pay for building the parser.
+    if (sys.argv[1:] if argv is None else argv) == ["--version"]:
+        print(__version__)
+        return 0
+
+    args = _shared_parser().parse_args(argv)
+
+    if args.version:
+        print(__version__)
+        return 0
+
+    if not args.input:
+        print("--input is required unless --version is provided", file=sys.stderr)
+        return 2
+
+    rules: list[Rule] | None = None
+    if not args.no_rules:
+        from triage.rules.cache import load_compiled_cached
+
+        rules = load_compiled_cached(_resolve_rulepack_paths(args))
+
+    inputs: list[str] = args.input
+    dump_paths = [
+        _prompt_dump_path(args.dump_llm_prompt, index, len(inputs)) if args.dump_llm_prompt else None
+        for index in range(len(inputs))
+    ]
+    if len(inputs) == 1:
+        outputs = [_triage_input(inputs[0], args, rules, dump_paths[0])]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Inputs already run concurrently; per-input rule worker pools would multiply
+        # the process count (jobs x rule workers), so each input scans in-process.
+        args.rule_workers = 1
+        # Each input is independent; threads overlap file I/O and the blocking Ollama calls.
+        with ThreadPoolExecutor(max_workers=max(1, min(args.jobs, len(inputs)))) as executor:
+            outputs = list(
+                executor.map(
+                    lambda item: _triage_input(item[0], args, rules, item[1]),
+                    zip(inputs, dump_paths),
+                )
             )
 
-    output, evidence_records = apply_output_mode(output, args.output_mode)
+    shaped_outputs: list[dict] = []
+    all_evidence_records: list[dict] = []
+    for input_path, output in zip(inputs, outputs):
+        output, evidence_records = apply_output_mode(output, args.output_mode)
+        if args.evidence_out and args.output_mode == "full":
+            evidence_records = extract_evidence_records(output)
+        if len(inputs) > 1:
+            evidence_records = [{"input": input_path, **record} for record in evidence_records]
+        shaped_outputs.append(output)
+        all_evidence_records.extend(evidence_records)
 
     if args.evidence_out:
-        if args.output_mode == "full":
-            evidence_records = extract_evidence_records(output)
-        evidence_path = Path(args.evidence_out)
-        evidence_path.parent.mkdir(parents=True, exist_ok=True)
-        with evidence_path.open("w", encoding="utf-8") as handle:
-            for record in evidence_records:
-                handle.write(json.dumps(record))
-                handle.write("\n")
+        _write_jsonl(Path(args.evidence_out), all_evidence_records)
 
     if args.validate:
-        try:
-            validate_output(output)
-        except ValueError as exc:
-            print(f"Output validation failed: {exc}", file=sys.stderr)
-            return 2
-
-    rendered = json.dumps(output, indent=2)
+        from triage.schemas.validate import validate_output
+
+        for input_path, output in zip(inputs, shaped_outputs):
+            try:
+                validate_output(output)
+            except ValueError as exc:
+                prefix = f"{input_path}: " if len(inputs) > 1 else ""
+                print(f"Output validation failed: {prefix}{exc}", file=sys.stderr)
+                return 2
+
+    # Stream the document member by member instead of rendering one large string.
+    document = shaped_outputs[0] if len(inputs) == 1 else shaped_outputs
+    chunks = _json.iter_compact_bytes(document) if args.compact else _json.iter_pretty_bytes(document)
     if args.out:
         out_path = Path(args.out)
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text(rendered + "\n", encoding="utf-8")
+        with out_path.open("wb") as handle:
+            handle.writelines(chunks)
+            handle.write(b"\n")
     else:
-        print(rendered)
+        _write_stdout_bytes(chunks)
     return 0
 
 
@@ -4,29 +4,52 @@ from __future__ import annotations
 
 import hashlib
 
+# Categories are dotted names ("fault.assert", "fault.reset_cause"), so grouping
+# keys off substrings; the first matching keyword wins. The rule vocabulary is
+# small and closed, so each category's keyword is resolved once and memoized.
+_GROUP_KEYWORDS = ("assert", "watchdog", "reset")
+_GROUP_KINDS: dict[str, str | None] = {}
 
-def stable_event_fingerprint(event: dict) -> dict[str, str]:
-    """Build a stable fingerprint payload for an event."""
+
+def _group_kind(category: str) -> str | None:
+    """Return the dedupe grouping keyword contained in ``category``, if any."""
+    for keyword in _GROUP_KEYWORDS:
+        if keyword in category:
+            return keyword
+    return None
+
+
+def stable_event_fingerprint(event: dict, hit_text: str | None = None) -> dict[str, str]:
+    """Build a stable fingerprint payload for an event.
+
+    ``hit_text`` is the normalized text of the matching line; when omitted it is read
+    from the event's ``_normalized_hit_text`` key.
+    """
     category = str(event.get("category", ""))
     severity = str(event.get("severity", ""))
     extracted = event.get("extracted", {}) or {}
-    hit_text = str(event.get("_normalized_hit_text", ""))
+    if hit_text is None:
+        hit_text = str(event.get("_normalized_hit_text", ""))
 
     canonical = "|".join(
-        [
+        (
             category,
             severity,
             hit_text,
             str(extracted.get("module", "")),
             str(extracted.get("file", "")),
             str(extracted.get("line", "")),
-        ]
+        )
     )
 
     stable_key = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
     hash_prefix = stable_key[:12]
 
-    if "assert" in category:
+    if category in _GROUP_KINDS:
+        kind = _GROUP_KINDS[category]
+    else:
+        kind = _GROUP_KINDS[category] = _group_kind(category)
+    if kind == "assert":
         module = extracted.get("module")
         file_name = extracted.get("file")
         line_no = extracted.get("line")
@@ -34,9 +57,9 @@ def stable_event_fingerprint(event: dict) -> dict[str, str]:
             dedupe_group = f"assert:{module}:{file_name}:{line_no}"
         else:
             dedupe_group = f"assert:{hash_prefix}"
-    elif "watchdog" in category:
+    elif kind == "watchdog":
         dedupe_group = f"watchdog:{hash_prefix}"
-    elif "reset" in category:
+    elif kind == "reset":
         cause = extracted.get("cause")
         dedupe_group = f"reset:{cause}" if cause else f"reset:{hash_prefix}"
     else:
@@ -2,9 +2,22 @@
 
 from __future__ import annotations
 
-from pathlib import Path
+import mmap
+import os
 
 
 def read_log(path: str) -> str:
-    """Read a UTF-8 log file and return its text."""
-    return Path(path).read_text(encoding="utf-8")
+    """Read a UTF-8 log file and return its text.
+
+    The file is memory-mapped and decoded straight from the mapping, so the raw
+    bytes are never copied onto the Python heap. Newlines are translated like
+    ``Path.read_text`` does.
+    """
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            text = str(mapped, "utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
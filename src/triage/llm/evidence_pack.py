@@ -2,38 +2,44 @@
 
 from __future__ import annotations
 
-import copy
-import json
+import heapq
+from types import MappingProxyType
 from typing import Any
 
+from triage import _json
+
 _SEVERITY_SCORES = {"fatal": 100, "high": 60, "medium": 30, "low": 10, "info": 1}
+# Common case variants resolve with one dict lookup; anything else falls back to .lower().
+_SEVERITY_SCORES.update({key.upper(): value for key, value in _SEVERITY_SCORES.items()})
+_SEVERITY_SCORES.update({key.title(): value for key, value in _SEVERITY_SCORES.items()})
+_EMPTY: MappingProxyType = MappingProxyType({})
+# Only the first few trimming steps are listed in the meta; trimming_count has the total.
+_MAX_TRIMMING_ENTRIES = 12
 
 
 
-def _event_rank_score(event: dict[str, Any]) -> int:
+def _event_rank_key(event: dict[str, Any]) -> tuple[int, int]:
+    """Return the (score, -hit_line) sort key for one event, computed in a single pass."""
     explicit = event.get("score")
     if isinstance(explicit, (int, float)):
         score = int(explicit)
     else:
-        severity = str(event.get("severity", "")).lower()
-        confidence = float(event.get("confidence", 0.0))
-        score = _SEVERITY_SCORES.get(severity, 0) + round(confidence * 20)
+        severity = event.get("severity")
+        severity_score = _SEVERITY_SCORES.get(severity) if isinstance(severity, str) else None
+        if severity_score is None:
+            severity_score = _SEVERITY_SCORES.get(str(severity).lower(), 0)
+        score = severity_score + round(float(event.get("confidence", 0.0)) * 20)
 
     if event.get("boot_blocking"):
         score += 1000
-    return score
+    line_start = (event.get("where") or _EMPTY).get("line_range", _EMPTY).get("start", 10**9)
+    return score, -int(line_start)
 
 
 def rank_events(events: list[dict]) -> list[dict]:
     """Rank events descending by importance for LLM evidence selection."""
-    return sorted(
-        events,
-        key=lambda event: (
-            _event_rank_score(event),
-            -int(event.get("where", {}).get("line_range", {}).get("start", 10**9)),
-        ),
-        reverse=True,
-    )
+    # sorted() evaluates the key once per event (not per comparison) and stays stable on ties.
+    return sorted(events, key=_event_rank_key, reverse=True)
 
 
 
@@ -90,7 +96,10 @@ def _trimmed_event(event: dict[str, Any]) -> dict[str, Any]:
         "evidence",
         "hit_text",
     )
-    trimmed = {field: copy.deepcopy(event[field]) for field in keep_fields if field in event}
+    # Kept fields, including each evidence "lines" list, are shared with the source
+    # event: nothing below mutates them in place (_ensure_hit_line_evidence replaces
+    # "lines" wholesale), and the evidence list/dicts it does edit are rebuilt here.
+    trimmed = {field: event[field] for field in keep_fields if field in event}
 
     evidence = trimmed.get("evidence")
     if isinstance(evidence, list):
@@ -105,7 +114,7 @@ def _trimmed_event(event: dict[str, Any]) -> dict[str, Any]:
                 "end_line": item.get("end_line"),
             }
             if "lines" in item:
-                kept["lines"] = copy.deepcopy(item.get("lines"))
+                kept["lines"] = item["lines"]
             cleaned.append(kept)
         trimmed["evidence"] = cleaned
 
@@ -114,14 +123,17 @@ def _trimmed_event(event: dict[str, Any]) -> dict[str, Any]:
 
 
 def _serialized_size_chars(payload: dict[str, Any]) -> int:
-    return len(json.dumps(payload, separators=(",", ":"), ensure_ascii=False))
+    return _json.size_chars(payload)
 
 
 
 def _ensure_hit_line_evidence(event: dict[str, Any]) -> bool:
     """Ensure event evidence contains at least one line entry for the hit line."""
-    where = event.get("where") if isinstance(event.get("where"), dict) else {}
-    line_start = where.get("line_range", {}).get("start") if isinstance(where.get("line_range"), dict) else None
+    where = event.get("where")
+    if not isinstance(where, dict):
+        where = _EMPTY
+    line_range = where.get("line_range")
+    line_start = line_range.get("start") if isinstance(line_range, dict) else None
     if not isinstance(line_start, int):
         return False
 
@@ -152,24 +164,38 @@ def _ensure_hit_line_evidence(event: dict[str, Any]) -> bool:
         first["lines"] = [hit_line]
         return True
 
-    matched = next((line for line in lines if isinstance(line, dict) and line.get("idx") == line_start), None)
+    # Context windows list consecutive lines from start_line, so the hit line normally
+    # sits at a known offset; fall back to a scan for anything else.
+    matched = None
+    window_start = first.get("start_line")
+    if isinstance(window_start, int) and 0 <= line_start - window_start < len(lines):
+        candidate = lines[line_start - window_start]
+        if isinstance(candidate, dict) and candidate.get("idx") == line_start:
+            matched = candidate
+    if matched is None:
+        matched = next((line for line in lines if isinstance(line, dict) and line.get("idx") == line_start), None)
     if matched is None:
         first["lines"] = [hit_line]
         return True
 
-    text_value = matched.get("text") if isinstance(matched.get("text"), str) else hit_text
-    first["lines"] = [{"idx": line_start, "text": text_value}]
+    text_value = matched.get("text")
+    if not isinstance(text_value, str):
+        text_value = hit_text
+    reduced = [{"idx": line_start, "text": text_value}]
+    if lines == reduced:
+        # Already exactly the hit line: leave it alone and don't report a trim.
+        return False
+    first["lines"] = reduced
     return True
 
 
 def build_evidence_pack(output: dict, top_k: int = 8, max_chars: int = 30000) -> dict:
     """Build a budget-bounded evidence pack suitable for LLM prompting."""
     events = output.get("events") if isinstance(output.get("events"), list) else []
-    ranked = rank_events(events)
-
-    selected_events = [_trimmed_event(event) for event in ranked[: max(0, top_k)]]
-    if events and not selected_events:
-        selected_events = [_trimmed_event(ranked[0])]
+    # Only the top_k survive, so a bounded heap selection (O(n log k), stable on ties,
+    # same result as rank_events(events)[:k]) replaces the full sort.
+    top = heapq.nlargest(max(1, top_k), events, key=_event_rank_key) if events else []
+    selected_events = [_trimmed_event(event) for event in top]
 
     evidence_pack: dict[str, Any] = {
         "schema_version": output.get("schema_version"),
@@ -178,34 +204,37 @@ def build_evidence_pack(output: dict, top_k: int = 8, max_chars: int = 30000) ->
     }
 
     trimming_applied: list[str] = []
-    final_chars = _serialized_size_chars(evidence_pack)
-
     for idx, event in enumerate(selected_events):
         if _ensure_hit_line_evidence(event):
             trimming_applied.append(f"ensured_hit_line:event_index={idx}")
-    final_chars = _serialized_size_chars(evidence_pack)
 
-    while final_chars > max_chars and len(selected_events) > 1:
-        selected_events.pop()
-        trimming_applied.append("dropped_low_ranked_event")
-        final_chars = _serialized_size_chars(evidence_pack)
+    # Serialize the pack and each event once, then track the size incrementally:
+    # popping the last of n > 1 events removes its text plus one separating comma.
+    final_chars = _serialized_size_chars(evidence_pack)
+    event_sizes = [_serialized_size_chars(event) for event in selected_events]
 
-    evidence_pack["evidence_pack_meta"] = {
+    meta: dict[str, Any] = {
         "top_k_requested": top_k,
         "events_included": len(selected_events),
         "max_chars": max_chars,
-        "trimming_applied": trimming_applied[:12],
+        "trimming_applied": trimming_applied[:_MAX_TRIMMING_ENTRIES],
         "trimming_count": len(trimming_applied),
     }
+    evidence_pack["evidence_pack_meta"] = meta
+    # Appending the meta key adds ',"evidence_pack_meta":' plus the (small) meta object,
+    # so one trimming pass budgets for the meta it will end up carrying.
+    meta_overhead = len(',"evidence_pack_meta":')
 
-    while _serialized_size_chars(evidence_pack) > max_chars and len(selected_events) > 1:
+    while final_chars + meta_overhead + _serialized_size_chars(meta) > max_chars and len(selected_events) > 1:
         selected_events.pop()
-        trimming_applied.append("dropped_low_ranked_event")
-        evidence_pack["evidence_pack_meta"]["events_included"] = len(selected_events)
-        evidence_pack["evidence_pack_meta"]["trimming_applied"] = trimming_applied[:12]
-        evidence_pack["evidence_pack_meta"]["trimming_count"] = len(trimming_applied)
-
-    evidence_pack["evidence_pack_meta"]["final_chars"] = _serialized_size_chars(evidence_pack)
+        final_chars -= event_sizes.pop() + 1
+        # Extend the listed prefix in place instead of re-slicing the full log each pop.
+        if len(meta["trimming_applied"]) < _MAX_TRIMMING_ENTRIES:
+            meta["trimming_applied"].append("dropped_low_ranked_event")
+        meta["events_included"] = len(selected_events)
+        meta["trimming_count"] += 1
+
+    meta["final_chars"] = final_chars + meta_overhead + _serialized_size_chars(meta)
     if evidence_pack["evidence_pack_meta"]["final_chars"] > max_chars:
         evidence_pack["evidence_pack_meta"]["trimming_applied"] = ["meta_compacted"]
         evidence_pack["evidence_pack_meta"]["final_chars"] = _serialized_size_chars(evidence_pack)
@@ -3,18 +3,50 @@
 from __future__ import annotations
 
 import json
+import threading
 from typing import Any
+from urllib.parse import urlsplit
+
+from triage import _json
+
+# This module is itself imported lazily (only when --llm is used), so requests is
+# resolved once here; None means it is not installed and _post will say so.
+try:
+    import requests  # type: ignore
+    from requests.adapters import HTTPAdapter  # type: ignore
+except ModuleNotFoundError:
+    requests = None
+    HTTPAdapter = None
+
+# Transport errors raised while iterating a streamed body (read timeouts between
+# chunks, truncated chunked encoding).
+_STREAM_ERRORS: tuple[type[BaseException], ...] = (requests.RequestException,) if requests is not None else ()
+
+_SESSIONS: dict[str, Any] = {}
+_SESSIONS_LOCK = threading.Lock()
+_POOL_MAXSIZE = 4
+
+
+def _session_for(url: str) -> Any:
+    """Return a process-wide keep-alive session for the URL's origin."""
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(origin)
+        if session is None:
+            session = requests.Session()
+            session.mount(origin, HTTPAdapter(pool_connections=1, pool_maxsize=_POOL_MAXSIZE))
+            _SESSIONS[origin] = session
+        return session
 
 
 def _post(url: str, payload: dict[str, Any], timeout_s: int, model: str) -> Any:
-    """Call requests.post lazily so tests can run without installed dependency."""
-    try:
-        import requests
-    except ModuleNotFoundError as exc:
-        raise RuntimeError("The 'requests' package is required for OllamaClient") from exc
+    """POST via a pooled session; requests is optional so tests can run without it."""
+    if requests is None:
+        raise RuntimeError("The 'requests' package is required for OllamaClient")
 
     try:
-        return requests.post(url, json=payload, timeout=timeout_s)
+        return _session_for(url).post(url, json=payload, timeout=timeout_s, stream=True)
     except requests.ReadTimeout as exc:
         prompt_len = len(str(payload.get("prompt", "")))
         raise RuntimeError(
@@ -25,13 +57,43 @@ def _post(url: str, payload: dict[str, Any], timeout_s: int, model: str) -> Any:
         raise RuntimeError(f"Failed to connect to Ollama at {url}: {exc}") from exc
 
 
+def _read_stream(response: Any) -> str | None:
+    """Concatenate the ``response`` fragments of an Ollama NDJSON stream.
+
+    Returns ``None`` when no chunk carried a string ``response``.
+    """
+    fragments: list[str] = []
+    seen_fragment = False
+    for line in response.iter_lines():
+        if not line:
+            continue
+        try:
+            chunk = _json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError("Ollama returned invalid JSON in HTTP response body") from exc
+        if not isinstance(chunk, dict):
+            raise ValueError("Ollama returned invalid JSON in HTTP response body")
+        if "error" in chunk:
+            raise RuntimeError(f"Ollama reported an error mid-stream: {chunk['error']}")
+
+        fragment = chunk.get("response")
+        if isinstance(fragment, str):
+            fragments.append(fragment)
+            seen_fragment = True
+        if chunk.get("done"):
+            break
+    return "".join(fragments) if seen_fragment else None
+
+
 class OllamaClient:
     """Simple wrapper around the Ollama `/api/generate` endpoint."""
 
-    def __init__(self, host: str, model: str, timeout_s: int = 60) -> None:
+    def __init__(self, host: str, model: str, timeout_s: int = 60, keep_alive: str | None = "10m") -> None:
         self.host = host.rstrip("/")
         self.model = model
         self.timeout_s = timeout_s
+        self.keep_alive = keep_alive
+        self._url = f"{self.host}/api/generate"
 
     def generate_json(self, system: str, user: str, schema: dict[str, Any]) -> dict[str, Any]:
         """Generate a JSON response from a local Ollama model."""
@@ -40,32 +102,33 @@ class OllamaClient:
             "model": self.model,
             "prompt": user,
             "system": system,
-            "stream": False,
+            # Streamed NDJSON: the timeout bounds the gap between chunks rather than
+            # the whole generation, and the body is parsed as it arrives.
+            "stream": True,
             "format": "json",
         }
-        url = f"{self.host}/api/generate"
-
-        response = _post(url, payload, self.timeout_s, self.model)
-
-        if response.status_code != 200:
-            raise RuntimeError(
-                f"Ollama request failed with HTTP {response.status_code}: {response.text}"
-            )
+        if self.keep_alive is not None:
+            # Keep the model resident between passes and back-to-back CLI runs.
+            payload["keep_alive"] = self.keep_alive
 
+        response = _post(self._url, payload, self.timeout_s, self.model)
         try:
-            body = response.json()
-        except ValueError as exc:
-            raise ValueError("Ollama returned invalid JSON in HTTP response body") from exc
-
-        raw_result = body.get("response") if isinstance(body, dict) else None
-        if isinstance(raw_result, dict):
-            return raw_result
-
-        if not isinstance(raw_result, str):
+            if response.status_code != 200:
+                raise RuntimeError(
+                    f"Ollama request failed with HTTP {response.status_code}: {response.text}"
+                )
+            try:
+                raw_result = _read_stream(response)
+            except _STREAM_ERRORS as exc:
+                raise RuntimeError(f"Ollama stream from {self._url} was interrupted: {exc}") from exc
+        finally:
+            response.close()
+
+        if raw_result is None:
             raise ValueError("Ollama response does not contain a JSON string in 'response'")
 
         try:
-            parsed = json.loads(raw_result)
+            parsed = _json.loads(raw_result)
         except json.JSONDecodeError as exc:
             raise ValueError("Ollama returned invalid JSON content in 'response'") from exc
 
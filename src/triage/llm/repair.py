@@ -2,22 +2,34 @@
 
 from __future__ import annotations
 
-def _action_from_string(text: str, best_event_id: str) -> dict:
+# The list defaults are never returned as-is: every list field is rebuilt below.
+_SYNTHESIS_DEFAULTS: tuple[tuple[str, object], ...] = (
+    ("overall_confidence", 0.2),
+    ("executive_summary", ""),
+    ("root_cause_hypotheses", []),
+    ("recommended_next_actions", []),
+    ("missing_evidence", []),
+)
+
+# Items below come straight from the decoded model JSON, so they are exact str/dict/list
+# instances and per-item checks use ``type(x) is`` rather than ``isinstance``.
+
+def _action_from_string(text: str, default_support: list[str]) -> dict:
     return {
         "action": text[:300],
         "priority": "P1",
         "expected_signal": "Observe logs/behavior change after action.",
-        "supporting_event_ids": [best_event_id],
+        "supporting_event_ids": default_support,
     }
 
-def _repair_action_item(item: object, best_event_id: str) -> dict | None:
-    if isinstance(item, str):
+def _repair_action_item(item: object, default_support: list[str]) -> dict | None:
+    if type(item) is str:
         normalized = item.strip()
         if not normalized:
             return None
-        return _action_from_string(normalized, best_event_id)
+        return _action_from_string(normalized, default_support)
 
-    if not isinstance(item, dict):
+    if type(item) is not dict:
         return None
 
     action = item.get("action")
@@ -34,11 +46,11 @@ def _repair_action_item(item: object, best_event_id: str) -> dict | None:
 
     supporting_event_ids = item.get("supporting_event_ids")
     if not isinstance(supporting_event_ids, list) or not supporting_event_ids:
-        supporting_event_ids = [best_event_id]
+        supporting_event_ids = default_support
     else:
-        supporting_event_ids = [event_id for event_id in supporting_event_ids if isinstance(event_id, str)]
+        supporting_event_ids = [event_id for event_id in supporting_event_ids if type(event_id) is str]
         if not supporting_event_ids:
-            supporting_event_ids = [best_event_id]
+            supporting_event_ids = default_support
 
     return {
         "action": action.strip()[:300],
@@ -48,44 +60,44 @@ def _repair_action_item(item: object, best_event_id: str) -> dict | None:
     }
 
 def repair_llm_synthesis(candidate: dict, best_event_id: str) -> dict:
-    """Repair common llm_synthesis shape issues before validation."""
+    """Repair common llm_synthesis shape issues before validation.
 
+    Defaulted ``supporting_event_ids`` (and string hypotheses' empty ``next_actions``)
+    share one list per call; the result is meant to be validated and serialized,
+    not mutated in place.
+    """
+
+    # Missing keys are appended after the model's own keys, keeping its key order.
     repaired = dict(candidate)
+    for key, default in _SYNTHESIS_DEFAULTS:
+        repaired.setdefault(key, default)
 
-    if "overall_confidence" not in repaired:
-        repaired["overall_confidence"] = 0.2
-    if "executive_summary" not in repaired:
-        repaired["executive_summary"] = ""
-    if "root_cause_hypotheses" not in repaired:
-        repaired["root_cause_hypotheses"] = []
-    if "recommended_next_actions" not in repaired:
-        repaired["recommended_next_actions"] = []
-    if "missing_evidence" not in repaired:
-        repaired["missing_evidence"] = []
+    default_support = [best_event_id]
+    no_actions: list[dict] = []
 
     root_cause_hypotheses = repaired.get("root_cause_hypotheses")
     if isinstance(root_cause_hypotheses, list):
         fixed_hypotheses = []
         for item in root_cause_hypotheses:
-            if isinstance(item, str):
+            if type(item) is str:
                 fixed_hypotheses.append(
                     {
                         "title": item[:200],
                         "confidence": 0.3,
-                        "supporting_event_ids": [best_event_id],
+                        "supporting_event_ids": default_support,
                         "reasoning": item,
-                        "next_actions": [],
+                        "next_actions": no_actions,
                     }
                 )
                 continue
 
-            if isinstance(item, dict):
+            if type(item) is dict:
                 hypothesis = dict(item)
                 next_actions = hypothesis.get("next_actions")
                 if isinstance(next_actions, list):
                     repaired_actions = []
                     for action in next_actions:
-                        repaired_action = _repair_action_item(action, best_event_id)
+                        repaired_action = _repair_action_item(action, default_support)
                         if repaired_action is not None:
                             repaired_actions.append(repaired_action)
                     hypothesis["next_actions"] = repaired_actions
@@ -100,7 +112,7 @@ def repair_llm_synthesis(candidate: dict, best_event_id: str) -> dict:
     if isinstance(recommended_next_actions, list):
         repaired_actions = []
         for item in recommended_next_actions:
-            repaired_action = _repair_action_item(item, best_event_id)
+            repaired_action = _repair_action_item(item, default_support)
             if repaired_action is not None:
                 repaired_actions.append(repaired_action)
         repaired["recommended_next_actions"] = repaired_actions
@@ -113,9 +125,9 @@ def repair_llm_synthesis(candidate: dict, best_event_id: str) -> dict:
                 "why": "Model returned narrative text; structured fields missing.",
                 "how": "Collect targeted logs/telemetry; rerun triage.",
                 "priority": "medium",
-                "supporting_event_ids": [best_event_id],
+                "supporting_event_ids": default_support,
             }
-            if isinstance(item, str)
+            if type(item) is str
             else item
             for item in missing_evidence
         ]
@@ -4,6 +4,15 @@ from __future__ import annotations
 
 
 def _clamp(value: object, default: float) -> float:
+    # JSON-decoded numbers are already int/float; only other types need float() coercion.
+    if isinstance(value, (int, float)):
+        if value != value:
+            return default
+        return 0.0 if value < 0 else 1.0 if value > 1 else float(value)
+    return _clamp_coerce(value, default)
+
+
+def _clamp_coerce(value: object, default: float) -> float:
     try:
         number = float(value)
     except (TypeError, ValueError):
@@ -31,7 +40,7 @@ def repair_llm_facts(candidate: dict) -> dict:
 
     fixed_facts: list[dict] = []
     for item in facts:
-        if not isinstance(item, dict):
+        if type(item) is not dict:
             continue
 
         fact_text = item.get("fact")
@@ -42,7 +51,7 @@ def repair_llm_facts(candidate: dict) -> dict:
         if not isinstance(supporting_event_ids, list) or len(supporting_event_ids) < 1:
             continue
 
-        cleaned_event_ids = [event_id for event_id in supporting_event_ids if isinstance(event_id, str)]
+        cleaned_event_ids = [event_id for event_id in supporting_event_ids if type(event_id) is str]
         if not cleaned_event_ids:
             continue
 
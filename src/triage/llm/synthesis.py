@@ -2,7 +2,18 @@
 
 from __future__ import annotations
 
-import json
+from triage import _json
+
+# The output template is a constant, so it is serialized once at import.
+_OUTPUT_TEMPLATE_JSON = _json.dumps(
+    {
+        "overall_confidence": 0.2,
+        "executive_summary": "",
+        "root_cause_hypotheses": [],
+        "recommended_next_actions": [],
+        "missing_evidence": [],
+    }
+)
 
 
 def build_system_prompt() -> str:
@@ -25,19 +36,11 @@ def build_system_prompt() -> str:
 
 def build_user_prompt(llm_input: dict) -> str:
     """Build compact user prompt containing evidence-pack JSON."""
-    compact = json.dumps(llm_input, ensure_ascii=False, separators=(",", ":"))
-    output_template = {
-        "overall_confidence": 0.2,
-        "executive_summary": "",
-        "root_cause_hypotheses": [],
-        "recommended_next_actions": [],
-        "missing_evidence": [],
-    }
-    template_json = json.dumps(output_template, ensure_ascii=False, separators=(",", ":"))
+    compact = _json.dumps(llm_input)
     return (
         "INPUT EVIDENCE (do not copy to output):\n"
         f"{compact}\n"
         "OUTPUT TEMPLATE (fill values, keep keys exactly):\n"
-        f"{template_json}\n"
+        f"{_OUTPUT_TEMPLATE_JSON}\n"
         "Do not add any other keys."
     )
@@ -2,7 +2,30 @@
 
 from __future__ import annotations
 
-import json
+from triage import _json
+
+# Output templates are constants, so they are serialized once at import.
+_FACTS_TEMPLATE_JSON = _json.dumps(
+    {
+        "overall_grounding_confidence": 0.0,
+        "facts": [
+            {
+                "fact": "",
+                "supporting_event_ids": ["evt-1"],
+                "confidence": 0.0,
+            }
+        ],
+    }
+)
+_SYNTHESIS_TEMPLATE_JSON = _json.dumps(
+    {
+        "overall_confidence": 0.0,
+        "executive_summary": "",
+        "root_cause_hypotheses": [],
+        "recommended_next_actions": [],
+        "missing_evidence": [],
+    }
+)
 
 
 def build_facts_system_prompt() -> str:
@@ -21,23 +44,12 @@ def build_facts_system_prompt() -> str:
 
 def build_facts_user_prompt(llm_input: dict) -> str:
     """Build facts-pass user prompt with compact llm_input payload."""
-    compact = json.dumps(llm_input, ensure_ascii=False, separators=(",", ":"))
-    template = {
-        "overall_grounding_confidence": 0.0,
-        "facts": [
-            {
-                "fact": "",
-                "supporting_event_ids": ["evt-1"],
-                "confidence": 0.0,
-            }
-        ],
-    }
-    template_json = json.dumps(template, ensure_ascii=False, separators=(",", ":"))
+    compact = _json.dumps(llm_input)
     return (
         "INPUT LLM EVIDENCE PACK (do not copy to output):\n"
         f"{compact}\n"
         "OUTPUT TEMPLATE (keys must match exactly):\n"
-        f"{template_json}\n"
+        f"{_FACTS_TEMPLATE_JSON}\n"
         "Return JSON only with those top-level keys."
     )
 
@@ -55,21 +67,20 @@ def build_synthesis_system_prompt() -> str:
     )
 
 
-def build_synthesis_user_prompt(llm_facts: dict) -> str:
-    """Build synthesis-pass user prompt with compact llm_facts payload."""
-    compact = json.dumps(llm_facts, ensure_ascii=False, separators=(",", ":"))
-    template = {
-        "overall_confidence": 0.0,
-        "executive_summary": "",
-        "root_cause_hypotheses": [],
-        "recommended_next_actions": [],
-        "missing_evidence": [],
-    }
-    template_json = json.dumps(template, ensure_ascii=False, separators=(",", ":"))
+def build_synthesis_user_prompt(llm_facts: dict, serialized: str | None = None) -> str:
+    """Build synthesis-pass user prompt with compact llm_facts payload.
+
+    Callers that already serialized ``llm_facts`` compactly (e.g. for budget checks)
+    can pass it as ``serialized`` to skip a second encode.
+    """
+    if serialized is not None:
+        compact = serialized
+    else:
+        compact = _json.dumps(llm_facts)
     return (
         "INPUT LLM FACTS (source of truth; do not copy verbatim):\n"
         f"{compact}\n"
         "OUTPUT TEMPLATE (fill values; keep keys exactly):\n"
-        f"{template_json}\n"
+        f"{_SYNTHESIS_TEMPLATE_JSON}\n"
         "Return JSON only."
     )
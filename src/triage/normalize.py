@@ -3,16 +3,33 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import mmap
+import os
 import re
+from typing import Iterator
 
 _ANSI_ESCAPE_RE = re.compile(r"\x1B\[[0-?]*[ -/]*[@-~]")
 _CONTROL_CHAR_RE = re.compile(r"[\x00-\x08\x0B-\x1F\x7F]")
+# ANSI escapes and stray control characters removed in one pass. ANSI is tried first at
+# each position and its body holds no control characters, so this equals stripping
+# ANSI escapes and then control characters.
+_ANSI_OR_CONTROL_RE = re.compile(f"{_ANSI_ESCAPE_RE.pattern}|{_CONTROL_CHAR_RE.pattern}")
 _WEIRD_WHITESPACE_RE = re.compile(r"[\u00A0\u1680\u2000-\u200A\u202F\u205F\u3000]+")
+# Universal-newline line splitter over raw bytes (matches text-mode `open()` semantics).
+# Group 1 is the body of a terminated line, group 2 an unterminated final line.
+_LINE_BYTES_RE = re.compile(rb"([^\r\n]*)(?:\r\n|\r|\n)|([^\r\n]+)")
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True)
 class NormalizedLine:
-    """A single log line with raw and normalized representations."""
+    """A single log line with raw and normalized representations.
+
+    Slotted because one instance exists per input line; this drops the per-line
+    ``__dict__`` (roughly 340 -> 56 bytes of object overhead on CPython 3.11).
+    Not frozen: a frozen ``__init__`` routes every field through
+    ``object.__setattr__``, which more than doubles construction cost. Treat
+    instances as read-only all the same.
+    """
 
     idx: int
     raw: str
@@ -22,26 +39,50 @@ class NormalizedLine:
 def _normalize_line(raw_line: str) -> str:
     """Normalize a single line of log text."""
     text = raw_line.rstrip("\r\n")
+    if text.isascii() and text.isprintable():
+        # Plain printable ASCII (the bulk of BIOS logs) has nothing for the passes below.
+        return text.strip()
+    # NULs go first: dropping one can complete an escape sequence ("\x1B\x00[31m").
     text = text.replace("\x00", "")
-    text = _ANSI_ESCAPE_RE.sub("", text)
-    text = _CONTROL_CHAR_RE.sub("", text)
-    text = _WEIRD_WHITESPACE_RE.sub(" ", text)
+    text = _ANSI_OR_CONTROL_RE.sub("", text)
+    if not text.isascii():
+        # Every character in the class is non-ASCII; most lines skip this pass.
+        text = _WEIRD_WHITESPACE_RE.sub(" ", text)
     return text.strip()
 
 
-def load_and_normalize(path: str) -> list[NormalizedLine]:
-    """Load log file and return normalized lines."""
-    normalized: list[NormalizedLine] = []
-    with open(path, "r", encoding="utf-8", errors="replace") as handle:
-        for idx, raw_line in enumerate(handle, start=1):
-            normalized.append(
-                NormalizedLine(
+def _decode_line(match: re.Match[bytes]) -> str:
+    """Decode one matched line, translating its terminator to ``\\n`` like text-mode reads.
+
+    The body is taken straight from the capture group, so no terminator-stripping
+    copy of the line bytes is made.
+    """
+    body = match.group(1)
+    if body is None:
+        return match.group(2).decode("utf-8", errors="replace")
+    return body.decode("utf-8", errors="replace") + "\n"
+
+
+def iter_normalized(path: str) -> Iterator[NormalizedLine]:
+    """Lazily yield normalized lines from a memory-mapped log file."""
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            for idx, match in enumerate(_LINE_BYTES_RE.finditer(mapped), start=1):
+                raw_line = _decode_line(match)
+                yield NormalizedLine(
                     idx=idx,
                     raw=raw_line,
                     text=_normalize_line(raw_line),
                 )
-            )
-    return normalized
+
+
+def load_and_normalize(path: str) -> list[NormalizedLine]:
+    """Load log file and return normalized lines."""
+    return list(iter_normalized(path))
 
 
 def normalization_stats(lines: list[NormalizedLine]) -> dict[str, int]:
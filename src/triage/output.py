@@ -2,8 +2,6 @@
 
 from __future__ import annotations
 
-from copy import deepcopy
-
 
 _OUTPUT_MODES = {"full", "slim", "tiny"}
 
@@ -25,24 +23,41 @@ def _extract_evidence_records(output: dict) -> list[dict]:
         for evidence in evidence_entries:
             if not isinstance(evidence, dict):
                 continue
+            lines = evidence.get("lines")
             record = {
                 "event_id": event_id,
                 "ref": evidence.get("ref"),
                 "start_line": evidence.get("start_line"),
                 "end_line": evidence.get("end_line"),
-                "lines": evidence.get("lines") if isinstance(evidence.get("lines"), list) else [],
+                "lines": lines if isinstance(lines, list) else [],
             }
             records.append(record)
 
     return records
 
 
+def _find_hit_line(lines: list, hit_line: int, start_line: object) -> dict | None:
+    """Return the line entry with ``idx == hit_line``.
+
+    Context windows list consecutive lines from ``start_line``, so the entry is looked up
+    at its offset first; other layouts fall back to a scan.
+    """
+    if isinstance(start_line, int) and 0 <= hit_line - start_line < len(lines):
+        candidate = lines[hit_line - start_line]
+        if isinstance(candidate, dict) and candidate.get("idx") == hit_line:
+            return candidate
+    return next((line for line in lines if isinstance(line, dict) and line.get("idx") == hit_line), None)
+
+
 def apply_output_mode(output: dict, mode: str) -> tuple[dict, list[dict]]:
     """Apply output mode transforms and return (main_output, evidence_records)."""
     if mode not in _OUTPUT_MODES:
         raise ValueError(f"Unsupported output mode: {mode}")
 
-    transformed = deepcopy(output)
+    # Copy-on-write: only the event and evidence dicts reshaped below are copied. Other
+    # sections (boot_timeline segments, signals, llm_*) are shared with ``output``
+    # instead of being deep-copied.
+    transformed = dict(output)
     if mode == "full":
         return transformed, []
 
@@ -51,6 +66,7 @@ def apply_output_mode(output: dict, mode: str) -> tuple[dict, list[dict]]:
     if not isinstance(events, list):
         return transformed, evidence_records
 
+    events = transformed["events"] = [dict(event) if isinstance(event, dict) else event for event in events]
     for event in events:
         if not isinstance(event, dict):
             continue
@@ -60,6 +76,9 @@ def apply_output_mode(output: dict, mode: str) -> tuple[dict, list[dict]]:
         if not isinstance(evidence_entries, list):
             continue
 
+        evidence_entries = event["evidence"] = [
+            dict(evidence) if isinstance(evidence, dict) else evidence for evidence in evidence_entries
+        ]
         for evidence in evidence_entries:
             if not isinstance(evidence, dict):
                 continue
@@ -73,13 +92,7 @@ def apply_output_mode(output: dict, mode: str) -> tuple[dict, list[dict]]:
                 evidence.pop("lines", None)
                 continue
 
-            if isinstance(hit_line, int):
-                matched_line = next(
-                    (line for line in lines if isinstance(line, dict) and line.get("idx") == hit_line),
-                    None,
-                )
-            else:
-                matched_line = None
+            matched_line = _find_hit_line(lines, hit_line, evidence.get("start_line")) if isinstance(hit_line, int) else None
 
             if matched_line is None:
                 evidence["lines"] = []
@@ -18,7 +18,7 @@ class Phase(str, Enum):
     BDS = "BDS"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PhaseSpan:
     """A contiguous line span for a boot phase."""
 
@@ -28,7 +28,7 @@ class PhaseSpan:
     confidence: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Segment:
     """A top-level boot segment containing phase spans."""
 
@@ -61,6 +61,14 @@ _MARKERS: dict[Phase, list[tuple[re.Pattern[str], bool]]] = {
 
 _PHASE_ORDER = [Phase.SEC, Phase.PEI, Phase.DXE, Phase.BDS]
 
+# Union of every marker: one search rejects the (vast majority of) lines that hit
+# no phase. Lines that do match still go through the per-phase markers, since the
+# confidence counts each matching marker and a union match cannot report overlaps.
+_ANY_MARKER_RE = re.compile(
+    "|".join(f"(?:{marker_re.pattern})" for phase in _PHASE_ORDER for marker_re, _ in _MARKERS[phase]),
+    re.IGNORECASE,
+)
+
 
 def _line_hits_phase(text: str, phase: Phase) -> tuple[bool, bool, int]:
     """Return marker match metadata for a line and phase.
@@ -76,11 +84,19 @@ def _line_hits_phase(text: str, phase: Phase) -> tuple[bool, bool, int]:
     return (match_count > 0, strong, match_count)
 
 
-def detect_phases(lines: list[NormalizedLine]) -> list[PhaseSpan]:
-    """Detect boot phase spans from normalized lines."""
-    phase_hits: dict[Phase, dict[str, int | bool]] = {}
+class PhaseDetector:
+    """Incremental phase detector fed one normalized line at a time."""
 
-    for line in lines:
+    def __init__(self) -> None:
+        self._phase_hits: dict[Phase, dict[str, int | bool]] = {}
+        self._max_line = 0
+
+    def feed(self, line: NormalizedLine) -> None:
+        """Record phase marker hits for a single line."""
+        self._max_line = line.idx
+        if _ANY_MARKER_RE.search(line.text) is None:
+            return
+        phase_hits = self._phase_hits
         for phase in _PHASE_ORDER:
             matched, strong, matches = _line_hits_phase(line.text, phase)
             if not matched:
@@ -97,36 +113,45 @@ def detect_phases(lines: list[NormalizedLine]) -> list[PhaseSpan]:
                 phase_hits[phase]["matches"] = int(phase_hits[phase]["matches"]) + matches
             break
 
-    if not phase_hits:
-        return []
+    def finalize(self) -> list[PhaseSpan]:
+        """Return ordered phase spans for all lines fed so far."""
+        if not self._phase_hits:
+            return []
+
+        ordered = sorted(self._phase_hits.items(), key=lambda item: int(item[1]["start_line"]))
+
+        spans: list[PhaseSpan] = []
+        for pos, (phase, data) in enumerate(ordered):
+            start_line = int(data["start_line"])
+            strong = bool(data["strong"])
+            matches = int(data["matches"])
 
-    ordered = sorted(phase_hits.items(), key=lambda item: int(item[1]["start_line"]))
-
-    spans: list[PhaseSpan] = []
-    max_line = lines[-1].idx if lines else 0
-    for pos, (phase, data) in enumerate(ordered):
-        start_line = int(data["start_line"])
-        strong = bool(data["strong"])
-        matches = int(data["matches"])
-
-        if pos + 1 < len(ordered):
-            end_line = int(ordered[pos + 1][1]["start_line"]) - 1
-        else:
-            end_line = max_line
-
-        base_confidence = 0.95 if strong else 0.80
-        confidence = min(base_confidence + max(0, matches - 1) * 0.03, 0.99)
-
-        spans.append(
-            PhaseSpan(
-                phase=phase.value,
-                start_line=start_line,
-                end_line=end_line,
-                confidence=round(confidence, 2),
+            if pos + 1 < len(ordered):
+                end_line = int(ordered[pos + 1][1]["start_line"]) - 1
+            else:
+                end_line = self._max_line
+
+            base_confidence = 0.95 if strong else 0.80
+            confidence = min(base_confidence + max(0, matches - 1) * 0.03, 0.99)
+
+            spans.append(
+                PhaseSpan(
+                    phase=phase.value,
+                    start_line=start_line,
+                    end_line=end_line,
+                    confidence=round(confidence, 2),
+                )
             )
-        )
 
-    return spans
+        return spans
+
+
+def detect_phases(lines: list[NormalizedLine]) -> list[PhaseSpan]:
+    """Detect boot phase spans from normalized lines."""
+    detector = PhaseDetector()
+    for line in lines:
+        detector.feed(line)
+    return detector.finalize()
 
 
 def build_segments(lines: list[NormalizedLine], phases: list[PhaseSpan]) -> list[Segment]:
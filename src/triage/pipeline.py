@@ -0,0 +1,53 @@
+"""Fused single-pass scan over normalized log lines."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+from triage.normalize import NormalizedLine
+from triage.phases import PhaseDetector, PhaseSpan, Segment, build_segments
+from triage.signals.progress import Marker, MarkerExtractor
+from triage.signals.stalls import StallSignal, detect_stalls
+
+
+@dataclass(frozen=True)
+class ScanResult:
+    """Deterministic per-log structure gathered by :func:`scan_once`."""
+
+    lines: list[NormalizedLine]
+    phases: list[PhaseSpan]
+    segments: list[Segment]
+    markers: list[Marker]
+    stalls: list[StallSignal]
+    normalization: dict[str, int]
+
+
+def scan_once(lines_iter: Iterable[NormalizedLine]) -> ScanResult:
+    """Walk lines once, feeding every per-line visitor, then finalize derived signals.
+
+    Rule matching needs each line's resolved phase, which is only known once all
+    phase markers have been seen, so it runs afterwards over ``ScanResult.lines``.
+    """
+    lines: list[NormalizedLine] = []
+    phase_detector = PhaseDetector()
+    marker_extractor = MarkerExtractor()
+    empty_line_count = 0
+
+    for line in lines_iter:
+        lines.append(line)
+        phase_detector.feed(line)
+        marker_extractor.feed(line)
+        if not line.text:
+            empty_line_count += 1
+
+    phases = phase_detector.finalize()
+    markers = marker_extractor.finalize()
+    return ScanResult(
+        lines=lines,
+        phases=phases,
+        segments=build_segments(lines, phases),
+        markers=markers,
+        stalls=detect_stalls(markers, phases),
+        normalization={"line_count": len(lines), "empty_line_count": empty_line_count},
+    )
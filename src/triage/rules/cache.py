@@ -0,0 +1,154 @@
+"""On-disk cache for compiled rulepacks."""
+
+from __future__ import annotations
+
+import dataclasses
+from functools import lru_cache
+import hashlib
+import os
+from pathlib import Path
+import pickle
+import tempfile
+import threading
+
+from triage.rules import engine, loader
+from triage.rules.engine import Rule, compile_rules
+from triage.rules.loader import load_rulepack
+from triage.version import __version__
+
+# Bump when the pickle payload layout changes. Rule layout and compile semantics are
+# covered automatically by _code_digest().
+_CACHE_FORMAT = "5"
+_RULE_FIELDS = tuple(field.name for field in dataclasses.fields(Rule))
+_CACHE_DIR_ENV = "BIOSLOGTRIAGE_CACHE_DIR"
+_NO_CACHE_ENV = "BIOSLOGTRIAGE_NO_CACHE"
+
+# In-process memo keyed by (path, mtime_ns, size) of every rulepack, so repeated
+# loads in one process skip even the content hash and pickle read.
+_MEMO: dict[tuple[tuple[str, int, int], ...], list[Rule]] = {}
+_MEMO_LOCK = threading.Lock()
+
+
+def cache_dir() -> Path:
+    """Return the directory used for compiled rule caches."""
+    override = os.environ.get(_CACHE_DIR_ENV)
+    if override:
+        return Path(override)
+
+    try:
+        import platformdirs  # type: ignore
+    except ModuleNotFoundError:
+        base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+        root = Path(base) if base else Path.home() / ".cache"
+        return root / "bioslogtriage"
+    return Path(platformdirs.user_cache_dir("bioslogtriage"))
+
+
+@lru_cache(maxsize=1)
+def _code_digest() -> str:
+    """Digest of the Rule fields and the engine/loader source that compile them."""
+    digest = hashlib.sha256(",".join(_RULE_FIELDS).encode("utf-8"))
+    for module in (engine, loader):
+        digest.update(b"\0")
+        try:
+            digest.update(Path(module.__file__ or "").read_bytes())
+        except OSError:
+            # Source unavailable (e.g. a frozen build): fall back to the version alone.
+            digest.update(module.__name__.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _cache_key(paths: list[str]) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"{__version__}:{_CACHE_FORMAT}:{_code_digest()}".encode("utf-8"))
+    for path in paths:
+        digest.update(b"\0")
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+def _compile_path(path: str) -> list[Rule]:
+    return compile_rules(load_rulepack(path))
+
+
+def _compile_paths(paths: list[str]) -> list[Rule]:
+    if len(paths) <= 1:
+        return [rule for path in paths for rule in _compile_path(path)]
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    # libyaml parsing and file reads release the GIL; map() keeps rulepack order
+    # so match outcomes stay deterministic.
+    with ThreadPoolExecutor(max_workers=min(4, len(paths))) as executor:
+        compiled = list(executor.map(_compile_path, paths))
+    return [rule for rules in compiled for rule in rules]
+
+
+def _read_cache(cache_path: Path) -> list[Rule] | None:
+    try:
+        with cache_path.open("rb") as handle:
+            payload = pickle.load(handle)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError):
+        return None
+
+    if not isinstance(payload, dict) or payload.get("format") != _CACHE_FORMAT:
+        return None
+    if payload.get("fields") != _RULE_FIELDS:
+        return None
+    rules = payload.get("rules")
+    if not isinstance(rules, list) or not all(isinstance(rule, Rule) for rule in rules):
+        return None
+    return rules
+
+
+def _write_cache(cache_path: Path, rules: list[Rule]) -> None:
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=".rules-", suffix=".tmp", dir=cache_path.parent)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                pickle.dump({"format": _CACHE_FORMAT, "fields": _RULE_FIELDS, "rules": rules}, handle, protocol=5)
+            os.replace(tmp_name, cache_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError:
+        # Caching is best-effort; an unwritable cache dir must not fail triage.
+        return
+
+
+def load_compiled_cached(paths: list[str]) -> list[Rule]:
+    """Load and compile rulepacks, reusing an on-disk cache keyed by rulepack content.
+
+    The cache key covers the bytes of every rulepack (in order), the package
+    version, the cache format, and a digest of the rule engine and loader source,
+    so any edit to a rulepack or to the compile code forces a recompile.
+    Within one process, results are also memoized by each file's path, mtime and size.
+    Set ``BIOSLOGTRIAGE_NO_CACHE=1`` to bypass the cache entirely.
+    """
+    if os.environ.get(_NO_CACHE_ENV):
+        return _compile_paths(paths)
+
+    stat_key = _stat_key(paths)
+    with _MEMO_LOCK:
+        memoized = _MEMO.get(stat_key)
+    if memoized is not None:
+        return list(memoized)
+
+    cache_path = cache_dir() / f"rules-{_cache_key(paths)}.pkl"
+    rules = _read_cache(cache_path)
+    if rules is None:
+        rules = _compile_paths(paths)
+        _write_cache(cache_path, rules)
+
+    with _MEMO_LOCK:
+        _MEMO[stat_key] = rules
+    return list(rules)
+
+
+def _stat_key(paths: list[str]) -> tuple[tuple[str, int, int], ...]:
+    key = []
+    for path in paths:
+        stat = os.stat(path)
+        key.append((os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(key)
@@ -3,14 +3,35 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 import re
-from typing import Any
+import string
+from typing import Any, TypedDict
+
+try:
+    from re import _parser as _sre_parser  # type: ignore[attr-defined]
+except ImportError:  # Python 3.10
+    import sre_parse as _sre_parser  # type: ignore[no-redef]
 
 from triage.fingerprint import stable_event_fingerprint
 from triage.normalize import NormalizedLine
 from triage.phases import Segment
 
 _BDF_PATTERN = re.compile(r"^(?:(?P<domain>[0-9A-Fa-f]{4}):)?(?P<bus>[0-9A-Fa-f]{2}):(?P<dev>[0-9A-Fa-f]{2})\.(?P<func>[0-7])$")
+_LEADING_FLAGS_RE = re.compile(r"^\(\?[aiLmsux]+\)")
+_NAMED_GROUP_RE = re.compile(r"\(\?P<[A-Za-z_][A-Za-z0-9_]*>")
+# Group references only make sense inside the rule's own pattern, so such rules skip the prefilter.
+_GROUP_REFERENCE_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+_SCOPED_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"), (re.VERBOSE, "x"), (re.ASCII, "a"))
+_MIN_LITERAL_LEN = 3
+_REPEAT_OPS = {_sre_parser.MAX_REPEAT, _sre_parser.MIN_REPEAT}
+_FORMATTER = string.Formatter()
+# Non-ASCII characters that re's IGNORECASE matches against an ASCII letter.
+_ASCII_FOLD = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"})
+# Inputs shorter than this are matched in-process even when workers are requested,
+# since pool startup and pickling would outweigh the scan itself.
+_PARALLEL_MIN_LINES = 20_000
+_PARALLEL_CHUNK_LINES = 4_000
 
 
 @dataclass(frozen=True)
@@ -25,11 +46,23 @@ class Rule:
     pattern: re.Pattern[str]
     required_phase: str | None
     extracts: dict[str, str]
+    # A line can only match if it contains one of these (case-folded when the
+    # pattern is case-insensitive); empty means no literal prefilter.
+    literals: tuple[str, ...] = ()
+    # Precomputed so matches of simple rules skip groupdict() and BDF normalization.
+    has_named_groups: bool = True
+    needs_bdf_norm: bool = True
+    # ``extracts`` as (key, template, fields): ``fields`` lists the plain group names a
+    # template references, or is None for templates that need the full str.format path.
+    extract_plan: tuple[tuple[str, str, tuple[str, ...] | None], ...] = ()
 
 
-@dataclass(frozen=True)
-class Event:
-    """Event emitted by deterministic rules."""
+class Event(TypedDict):
+    """Event emitted by deterministic rules.
+
+    Built as a plain dict literal in ``run_rules``; deduplication later bumps
+    ``occurrences`` and extends ``where`` in place.
+    """
 
     event_id: str
     category: str
@@ -50,31 +83,198 @@ def compile_rules(rulepack: dict) -> list[Rule]:
     """Compile loaded rulepack entries into regex Rules."""
     compiled: list[Rule] = []
     for raw_rule in rulepack.get("rules", []):
+        pattern = re.compile(raw_rule["regex"])
+        extracts = {str(k): str(v) for k, v in raw_rule.get("extracts", {}).items()}
         compiled.append(
             Rule(
                 id=raw_rule["id"],
                 category=raw_rule["category"],
                 subcategory=raw_rule.get("subcategory"),
-                severity=raw_rule["severity"],
+                severity=str(raw_rule["severity"]).lower(),
                 base_confidence=float(raw_rule.get("base_confidence", raw_rule.get("confidence"))),
-                pattern=re.compile(raw_rule["regex"]),
+                pattern=pattern,
                 required_phase=raw_rule.get("required_phase"),
-                extracts={str(k): str(v) for k, v in raw_rule.get("extracts", {}).items()},
+                extracts=extracts,
+                literals=_rule_literals(raw_rule),
+                has_named_groups=bool(pattern.groupindex),
+                needs_bdf_norm="bdf" in pattern.groupindex or "bdf" in extracts,
+                extract_plan=tuple((key, value, _template_fields(value)) for key, value in extracts.items()),
             )
         )
     return compiled
 
 
-def _line_location(line_no: int, segments: list[Segment]) -> tuple[str | None, str | None]:
-    for segment in segments:
-        if segment.start_line <= line_no <= segment.end_line:
-            phase = None
-            for span in segment.phases:
-                if span.start_line <= line_no <= span.end_line:
-                    phase = span.phase
-                    break
-            return segment.segment_id, phase
-    return None, None
+def _template_fields(template: str) -> tuple[str, ...] | None:
+    """Return the plain field names in an extracts template, or None if it needs str.format.
+
+    Plain means ``{name}`` with no index, attribute, conversion or format spec; such a
+    template formats without error whenever every name is in the match's groups.
+    """
+    try:
+        parsed = list(_FORMATTER.parse(template))
+    except ValueError:
+        return None
+    fields: list[str] = []
+    for _literal, field_name, format_spec, conversion in parsed:
+        if field_name is None:
+            continue
+        if not field_name.isidentifier() or format_spec or conversion:
+            return None
+        fields.append(field_name)
+    return tuple(fields)
+
+
+def _rule_literals(raw_rule: dict) -> tuple[str, ...]:
+    """Return the literals gating a rule: YAML ``prefilter`` if declared, else derived from the regex."""
+    pattern = re.compile(raw_rule["regex"])
+    declared = raw_rule.get("prefilter")
+    if declared is not None:
+        literals = [declared] if isinstance(declared, str) else list(declared)
+    else:
+        try:
+            derived = _required_literals(_sre_parser.parse(pattern.pattern, pattern.flags))
+        except (re.error, RecursionError):
+            derived = None
+        literals = sorted(derived) if derived else []
+
+    if pattern.flags & re.IGNORECASE:
+        literals = [_fold_case(literal) for literal in literals]
+    return tuple(literals)
+
+
+def _required_literals(items: Any) -> frozenset[str] | None:
+    """Find literals one of which must appear in any match of the parsed ``items`` sequence.
+
+    Only ASCII literal runs are collected so case-folding stays exact. Returns the
+    candidate set whose shortest literal is longest, or ``None`` when nothing usable
+    is required.
+    """
+    candidates: list[frozenset[str]] = []
+    run: list[str] = []
+
+    def flush() -> None:
+        if len(run) >= _MIN_LITERAL_LEN:
+            candidates.append(frozenset(["".join(run)]))
+        run.clear()
+
+    for op, av in items:
+        if op is _sre_parser.LITERAL and av < 128:
+            run.append(chr(av))
+            continue
+        if op is _sre_parser.AT:
+            # Zero-width assertions keep the neighbouring literals adjacent in the text.
+            continue
+        flush()
+
+        if op is _sre_parser.SUBPATTERN:
+            _group, add_flags, del_flags, body = av
+            if not add_flags and not del_flags:
+                found = _required_literals(body)
+                if found:
+                    candidates.append(found)
+        elif op is _sre_parser.BRANCH:
+            alternatives = [_required_literals(branch) for branch in av[1]]
+            if all(alternatives):
+                candidates.append(frozenset().union(*alternatives))
+        elif op in _REPEAT_OPS and av[0] >= 1:
+            found = _required_literals(av[2])
+            if found:
+                candidates.append(found)
+    flush()
+
+    if not candidates:
+        return None
+    return max(candidates, key=lambda literals: min(len(literal) for literal in literals))
+
+
+def _fold_case(text: str) -> str:
+    if text.isascii():
+        return text.lower()
+    return text.translate(_ASCII_FOLD).lower()
+
+
+def _scoped_pattern_source(pattern: re.Pattern[str]) -> str | None:
+    """Rewrite a compiled rule pattern as a self-contained, group-free alternation branch."""
+    source = pattern.pattern
+    if _GROUP_REFERENCE_RE.search(source):
+        return None
+    # The group rewrite below is textual; an escaped or bracketed "(?P<" would be
+    # rewritten too, so only merge patterns where every occurrence is a real group.
+    if len(_NAMED_GROUP_RE.findall(source)) != len(pattern.groupindex):
+        return None
+
+    while True:
+        stripped = _LEADING_FLAGS_RE.sub("", source, count=1)
+        if stripped == source:
+            break
+        source = stripped
+    source = _NAMED_GROUP_RE.sub("(?:", source)
+
+    flags = "".join(letter for flag, letter in _SCOPED_FLAGS if pattern.flags & flag)
+    return f"(?{flags}:{source})" if flags else f"(?:{source})"
+
+
+@lru_cache(maxsize=32)
+def _compile_prefilter(
+    patterns: tuple[tuple[str, int], ...],
+) -> tuple[re.Pattern[str] | None, tuple[int, ...]]:
+    branches: list[str] = []
+    unfiltered: list[int] = []
+    for index, (source, flags) in enumerate(patterns):
+        branch = _scoped_pattern_source(re.compile(source, flags))
+        if branch is None:
+            unfiltered.append(index)
+        else:
+            branches.append(branch)
+
+    if not branches:
+        return None, tuple(range(len(patterns)))
+    try:
+        combined = re.compile("|".join(branches))
+    except re.error:
+        return None, tuple(range(len(patterns)))
+    return combined, tuple(unfiltered)
+
+
+def build_prefilter(rules: list[Rule]) -> tuple[re.Pattern[str] | None, list[Rule]]:
+    """Build a combined multi-pattern regex that matches a line iff some rule could match it.
+
+    Returns ``(prefilter, unfiltered_rules)``; rules that cannot be merged into the
+    alternation (for example because they use backreferences) are returned separately
+    and must always be evaluated.
+    """
+    combined, unfiltered = _compile_prefilter(tuple((rule.pattern.pattern, rule.pattern.flags) for rule in rules))
+    return combined, [rules[index] for index in unfiltered]
+
+
+_NO_LOCATION: tuple[str | None, str | None] = (None, None)
+
+
+def _line_location_table(segments: list[Segment]) -> list[tuple[str | None, str | None]]:
+    """Return a table mapping line number -> (segment_id, phase).
+
+    A line belongs to the first segment containing it, and takes the phase of the
+    first span of that segment containing it. Ranges are filled in reverse order so
+    earlier segments and spans overwrite later ones; lines past the end of the table
+    have no location.
+    """
+    size = max((segment.end_line for segment in segments), default=0) + 1
+    table = [_NO_LOCATION] * max(size, 0)
+
+    def fill(start: int, end: int, value: tuple[str | None, str | None]) -> None:
+        start = max(start, 0)
+        if start <= end:
+            table[start : end + 1] = [value] * (end + 1 - start)
+
+    for segment in reversed(segments):
+        fill(segment.start_line, segment.end_line, (segment.segment_id, None))
+        for span in reversed(segment.phases):
+            fill(
+                max(span.start_line, segment.start_line),
+                min(span.end_line, segment.end_line),
+                (segment.segment_id, span.phase),
+            )
+    return table
 
 
 def _event_evidence(
@@ -83,6 +283,7 @@ def _event_evidence(
     segment_id: str,
     context_lines: int,
     include_lines: bool,
+    line_payloads: list[dict[str, Any] | None] | None = None,
 ) -> list[dict[str, Any]]:
     start_line = max(1, hit_line - context_lines)
     end_line = min(len(lines), hit_line + context_lines)
@@ -94,14 +295,150 @@ def _event_evidence(
     }
 
     if include_lines:
-        evidence["lines"] = [
-            {"idx": normalized_line.idx, "text": normalized_line.text}
-            for normalized_line in lines[start_line - 1 : end_line]
-        ]
+        if line_payloads is None:
+            evidence["lines"] = [
+                {"idx": normalized_line.idx, "text": normalized_line.text}
+                for normalized_line in lines[start_line - 1 : end_line]
+            ]
+        else:
+            # Overlapping context windows share one read-only payload dict per line.
+            for position in range(start_line - 1, end_line):
+                if line_payloads[position] is None:
+                    normalized_line = lines[position]
+                    line_payloads[position] = {"idx": normalized_line.idx, "text": normalized_line.text}
+            evidence["lines"] = line_payloads[start_line - 1 : end_line]
 
     return [evidence]
 
 
+# (position, text, phase) of one line handed to the matcher.
+_MatchInput = tuple[int, str, str | None]
+# (position, rule index, named group values) of one rule hit.
+_MatchHit = tuple[int, int, dict[str, str]]
+# Literal -> indexes of the rules it gates.
+_LiteralIndex = tuple[tuple[str, tuple[int, ...]], ...]
+_Dispatch = tuple[
+    _LiteralIndex,  # literals of IGNORECASE rules, tested against the case-folded line
+    _LiteralIndex,  # literals of case-sensitive rules, tested against the line as-is
+    re.Pattern[str] | None,  # combined regex gating the rules below
+    tuple[int, ...],  # rules without literals that the combined regex covers
+    tuple[int, ...],  # rules evaluated on every line
+]
+# Dispatch tables keyed by line phase; ``None`` holds the rules without a required phase
+# and serves every phase no rule requires.
+_MatcherState = tuple[dict[str | None, _Dispatch], list[Rule]]
+_WORKER_MATCHER: _MatcherState | None = None
+
+
+def _matcher_state(rules: list[Rule], use_prefilter: bool) -> _MatcherState:
+    any_phase = [index for index, rule in enumerate(rules) if not rule.required_phase]
+    buckets = {None: _dispatch(rules, any_phase, use_prefilter)}
+    for phase in dict.fromkeys(rule.required_phase for rule in rules if rule.required_phase):
+        indexes = [index for index, rule in enumerate(rules) if not rule.required_phase or rule.required_phase == phase]
+        buckets[phase] = _dispatch(rules, indexes, use_prefilter)
+    return buckets, rules
+
+
+def _dispatch(rules: list[Rule], indexes: list[int], use_prefilter: bool) -> _Dispatch:
+    if not use_prefilter:
+        return (), (), None, (), tuple(indexes)
+
+    folded: dict[str, list[int]] = {}
+    exact: dict[str, list[int]] = {}
+    literal_free: list[int] = []
+    for index in indexes:
+        rule = rules[index]
+        if not rule.literals:
+            literal_free.append(index)
+            continue
+        table = folded if rule.pattern.flags & re.IGNORECASE else exact
+        for literal in rule.literals:
+            table.setdefault(literal, []).append(index)
+
+    prefilter: re.Pattern[str] | None = None
+    gated: tuple[int, ...] = ()
+    always = tuple(literal_free)
+    if literal_free:
+        prefilter, unfiltered_rules = build_prefilter([rules[index] for index in literal_free])
+        if prefilter is not None:
+            unfiltered_ids = {id(rule) for rule in unfiltered_rules}
+            gated = tuple(index for index in literal_free if id(rules[index]) not in unfiltered_ids)
+            always = tuple(index for index in literal_free if id(rules[index]) in unfiltered_ids)
+
+    def freeze(table: dict[str, list[int]]) -> _LiteralIndex:
+        return tuple((literal, tuple(indexes)) for literal, indexes in table.items())
+
+    return freeze(folded), freeze(exact), prefilter, gated, always
+
+
+def _match_lines(entries: list[_MatchInput], state: _MatcherState) -> list[_MatchHit]:
+    """Return every rule hit in ``entries``, in line order then rule order."""
+    buckets, rules = state
+    any_phase = buckets[None]
+    hits: list[_MatchHit] = []
+    for position, text, phase in entries:
+        folded_index, exact_index, prefilter, gated, always = buckets.get(phase, any_phase)
+        candidates = list(always)
+        if folded_index:
+            folded_text = _fold_case(text)
+            candidates += [index for literal, indexes in folded_index if literal in folded_text for index in indexes]
+        if exact_index:
+            candidates += [index for literal, indexes in exact_index if literal in text for index in indexes]
+        if gated and prefilter is not None and prefilter.search(text) is not None:
+            candidates += gated
+        if not candidates:
+            continue
+        if len(candidates) > 1:
+            candidates = sorted(set(candidates))
+
+        for rule_index in candidates:
+            rule = rules[rule_index]
+            match = rule.pattern.search(text)
+            if not match:
+                continue
+            if rule.has_named_groups:
+                group_values = {key: value for key, value in match.groupdict().items() if value is not None}
+            else:
+                group_values = {}
+            hits.append((position, rule_index, group_values))
+    return hits
+
+
+def _init_match_worker(rules: list[Rule], use_prefilter: bool) -> None:
+    global _WORKER_MATCHER
+    _WORKER_MATCHER = _matcher_state(rules, use_prefilter)
+
+
+def _match_worker_chunk(entries: list[_MatchInput]) -> list[_MatchHit]:
+    assert _WORKER_MATCHER is not None
+    return _match_lines(entries, _WORKER_MATCHER)
+
+
+def _match_all(
+    entries: list[_MatchInput],
+    rules: list[Rule],
+    use_prefilter: bool,
+    workers: int,
+) -> list[_MatchHit]:
+    if workers <= 1 or len(entries) < _PARALLEL_MIN_LINES:
+        return _match_lines(entries, _matcher_state(rules, use_prefilter))
+
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    chunks = [entries[start : start + _PARALLEL_CHUNK_LINES] for start in range(0, len(entries), _PARALLEL_CHUNK_LINES)]
+    # Workers only match; map() keeps chunk order, so the single-threaded merge below
+    # assigns event ids and dedupes exactly as a sequential scan would.
+    # spawn, not fork: callers (e.g. the CLI's per-input thread pool) may be multithreaded.
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_match_worker,
+        initargs=(rules, use_prefilter),
+    ) as executor:
+        return [hit for chunk_hits in executor.map(_match_worker_chunk, chunks) for hit in chunk_hits]
+
+
 def run_rules(
     lines: list[NormalizedLine],
     segments: list[Segment],
@@ -109,109 +446,121 @@ def run_rules(
     *,
     context_lines: int = 20,
     include_evidence_lines: bool = True,
+    use_prefilter: bool = True,
+    workers: int = 1,
 ) -> list[dict]:
-    """Run single-line rules and emit de-duplicated events."""
+    """Run single-line rules and emit de-duplicated events.
+
+    With ``use_prefilter`` (the default) a rule's regex only runs on lines containing
+    one of its required literals (see ``Rule.literals``); lines containing none skip
+    per-rule evaluation entirely. Rules without literals are gated by one combined
+    regex of just those rules (see :func:`build_prefilter`).
+
+    With ``workers`` > 1, inputs of at least ``_PARALLEL_MIN_LINES`` lines are matched
+    in that many worker processes; events are identical to a single-process run.
+    """
     deduped_events: list[dict[str, Any]] = []
-    stable_index: dict[str, int] = {}
+    events_by_key: dict[str, dict[str, Any]] = {}
+    event_count = 0
+    line_payloads: list[dict[str, Any] | None] | None = [None] * len(lines) if include_evidence_lines else None
 
-    for line in lines:
-        segment_id, phase = _line_location(line.idx, segments)
+    locations = _line_location_table(segments)
+    location_count = len(locations)
+    entries: list[_MatchInput] = [
+        (position, line.text, (locations[line.idx] if 0 <= line.idx < location_count else _NO_LOCATION)[1])
+        for position, line in enumerate(lines)
+    ]
+    for position, rule_index, group_values in _match_all(entries, rules, use_prefilter, workers):
+        line = lines[position]
+        rule = rules[rule_index]
+        segment_id, phase = locations[line.idx] if 0 <= line.idx < location_count else _NO_LOCATION
         resolved_segment = segment_id or "seg-unknown"
-        for rule in rules:
-            if rule.required_phase and phase != rule.required_phase:
-                continue
 
-            match = rule.pattern.search(line.text)
-            if not match:
+        confidence = rule.base_confidence
+        if rule.required_phase and phase == rule.required_phase:
+            confidence = min(confidence + 0.03, 0.99)
+        confidence = round(confidence, 2)
+
+        extracted = dict(group_values) if rule.extracts else group_values
+        for key, value, fields in rule.extract_plan:
+            if key in extracted:
                 continue
+            if value in group_values:
+                extracted[key] = group_values[value]
+            elif fields is None:
+                try:
+                    extracted[key] = value.format(**group_values)
+                except KeyError:
+                    extracted[key] = value
+            elif all(field in group_values for field in fields):
+                extracted[key] = value.format(**group_values)
+            else:
+                extracted[key] = value
+
+        if (
+            rule.category == "memory.mrc"
+            and rule.subcategory == "spd_addr_zero"
+            and {"mc", "ch", "dimm", "spd"}.issubset(extracted)
+        ):
+            extracted["spd_addr"] = f"0x{extracted['spd']}"
+            extracted["slot"] = f"MC{extracted['mc']}_C{extracted['ch']}_D{extracted['dimm']}"
 
-            confidence = rule.base_confidence
-            if rule.required_phase and phase == rule.required_phase:
-                confidence = min(confidence + 0.03, 0.99)
-            confidence = round(confidence, 2)
-
-            extracted = {key: value for key, value in match.groupdict().items() if value is not None}
-            if rule.extracts:
-                group_values = {k: v for k, v in match.groupdict().items() if v is not None}
-                for key, value in rule.extracts.items():
-                    if key in extracted:
-                        continue
-                    if value in group_values:
-                        extracted[key] = group_values[value]
-                    else:
-                        try:
-                            extracted[key] = value.format(**group_values)
-                        except KeyError:
-                            extracted[key] = value
-
-            if (
-                rule.category == "memory.mrc"
-                and rule.subcategory == "spd_addr_zero"
-                and {"mc", "ch", "dimm", "spd"}.issubset(extracted)
-            ):
-                extracted["spd_addr"] = f"0x{extracted['spd']}"
-                extracted["slot"] = f"MC{extracted['mc']}_C{extracted['ch']}_D{extracted['dimm']}"
-
-            if "bdf" in extracted and "bdf_norm" not in extracted:
-                bdf_match = _BDF_PATTERN.match(extracted["bdf"])
-                if bdf_match:
-                    domain = (bdf_match.group("domain") or "0000").lower()
-                    bus = bdf_match.group("bus").lower()
-                    dev = bdf_match.group("dev").lower()
-                    func = bdf_match.group("func")
-                    extracted["bdf_norm"] = f"{domain}:{bus}:{dev}.{func}"
-            where: dict[str, Any] = {
-                "segment_id": resolved_segment,
-                "line_range": {"start": line.idx, "end": line.idx},
-            }
-            if phase is not None:
-                where["phase"] = phase
-
-            event_payload: dict[str, Any] = {
-                "category": rule.category,
-                "subcategory": rule.subcategory,
-                "severity": rule.severity,
-                "extracted": extracted,
-                "_normalized_hit_text": line.text,
-            }
-            fingerprint = stable_event_fingerprint(event_payload)
-
-            evidence = _event_evidence(
+        if rule.needs_bdf_norm and "bdf" in extracted and "bdf_norm" not in extracted:
+            bdf_match = _BDF_PATTERN.match(extracted["bdf"])
+            if bdf_match:
+                domain = (bdf_match.group("domain") or "0000").lower()
+                bus = bdf_match.group("bus").lower()
+                dev = bdf_match.group("dev").lower()
+                func = bdf_match.group("func")
+                extracted["bdf_norm"] = f"{domain}:{bus}:{dev}.{func}"
+        fingerprint = stable_event_fingerprint(
+            {"category": rule.category, "severity": rule.severity, "extracted": extracted},
+            line.text,
+        )
+
+        existing_event = events_by_key.get(fingerprint["stable_key"])
+        if existing_event is not None:
+            existing_event["occurrences"] += 1
+            existing_event["where"].setdefault("other_lines", []).append(line.idx)
+            continue
+
+        where: dict[str, Any] = {
+            "segment_id": resolved_segment,
+            "line_range": {"start": line.idx, "end": line.idx},
+        }
+        if phase is not None:
+            where["phase"] = phase
+
+        event: Event = {
+            "event_id": f"evt-{event_count + 1}",
+            "category": rule.category,
+            "subcategory": rule.subcategory,
+            "severity": rule.severity,
+            "confidence": confidence,
+            "boot_blocking": rule.severity == "fatal",
+            "where": where,
+            "extracted": extracted,
+            "rule_hits": [
+                {
+                    "rule_id": rule.id,
+                    "weight": 1.0,
+                    "match_confidence": confidence,
+                }
+            ],
+            "fingerprint": fingerprint,
+            "occurrences": 1,
+            "evidence": _event_evidence(
                 lines=lines,
                 hit_line=line.idx,
                 segment_id=resolved_segment,
                 context_lines=context_lines,
                 include_lines=include_evidence_lines,
-            )
-
-            if fingerprint["stable_key"] in stable_index:
-                existing_event = deduped_events[stable_index[fingerprint["stable_key"]]]
-                existing_event["occurrences"] += 1
-                existing_event["where"].setdefault("other_lines", []).append(line.idx)
-                continue
-
-            event = Event(
-                event_id=f"evt-{len(deduped_events) + 1}",
-                category=rule.category,
-                subcategory=rule.subcategory,
-                severity=rule.severity,
-                confidence=confidence,
-                boot_blocking=(rule.severity == "fatal"),
-                where=where,
-                extracted=extracted,
-                rule_hits=[
-                    {
-                        "rule_id": rule.id,
-                        "weight": 1.0,
-                        "match_confidence": confidence,
-                    }
-                ],
-                fingerprint=fingerprint,
-                occurrences=1,
-                evidence=evidence,
-                hit_text=line.text,
-            )
-            deduped_events.append(event.__dict__)
-            stable_index[fingerprint["stable_key"]] = len(deduped_events) - 1
+                line_payloads=line_payloads,
+            ),
+            "hit_text": line.text,
+        }
+        deduped_events.append(event)
+        events_by_key[fingerprint["stable_key"]] = event
+        event_count += 1
 
     return deduped_events
@@ -3,8 +3,11 @@
 from __future__ import annotations
 
 import json
+import logging
 from pathlib import Path
 
+_LOGGER = logging.getLogger(__name__)
+
 _REQUIRED_RULE_KEYS = {
     "id",
     "category",
@@ -14,17 +17,24 @@ _REQUIRED_RULE_KEYS = {
 }
 
 
+def _yaml_loader(yaml: object) -> type:
+    """Prefer the libyaml-backed safe loader; it parses ~10x faster than pure Python."""
+    loader = getattr(yaml, "CSafeLoader", None)
+    if loader is None:
+        _LOGGER.debug("libyaml is unavailable; falling back to pure-Python yaml.SafeLoader")
+        return yaml.SafeLoader  # type: ignore[attr-defined]
+    return loader
+
 
 def load_rulepack(path: str) -> dict:
     """Load and minimally validate a YAML rulepack."""
-    rulepack_path = Path(path)
-    with rulepack_path.open("r", encoding="utf-8") as handle:
-        raw = handle.read()
+    # Bytes go straight to libyaml (and json), skipping a decode/re-encode round trip.
+    raw = Path(path).read_bytes()
 
     try:
         import yaml  # type: ignore
 
-        data = yaml.safe_load(raw)
+        data = yaml.load(raw, Loader=_yaml_loader(yaml))
     except ModuleNotFoundError:
         # Fallback parser for offline test environments when PyYAML is unavailable.
         # JSON is valid YAML, and built-in rulepacks use this compatible subset.
@@ -55,4 +65,10 @@ def load_rulepack(path: str) -> dict:
         if not isinstance(extracts, dict):
             raise ValueError(f"Rule #{idx} has invalid extracts; expected mapping")
 
+        prefilter = rule.get("prefilter")
+        if prefilter is not None:
+            literals = [prefilter] if isinstance(prefilter, str) else prefilter
+            if not isinstance(literals, list) or not all(isinstance(item, str) and item for item in literals):
+                raise ValueError(f"Rule #{idx} has invalid prefilter; expected string or list of strings")
+
     return data
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 import importlib
 import importlib.util
 import json
 import re
 from importlib import resources
+from typing import Any, Callable
 
 
 _VERSION_PATTERN = re.compile(r"^[0-9]+\.[0-9]+\.[0-9]+$")
@@ -46,21 +48,49 @@ def _validate_without_jsonschema(data: dict) -> None:
         raise ValueError("Schema validation failed at llm_enabled: must be a boolean")
 
 
+@lru_cache(maxsize=1)
+def _compiled_validator() -> Callable[[dict], Any] | None:
+    """Compile the output schema to Python code once, when fastjsonschema is installed."""
+    if importlib.util.find_spec("fastjsonschema") is None:
+        return None
+    fastjsonschema = importlib.import_module("fastjsonschema")
+    # use_default=False: validation must never write schema defaults into the output.
+    return fastjsonschema.compile(load_schema(), use_default=False)
+
+
+@lru_cache(maxsize=1)
+def _jsonschema_validator() -> Any | None:
+    """Build the reference jsonschema validator once, when jsonschema is installed."""
+    if importlib.util.find_spec("jsonschema") is None:
+        return None
+    jsonschema = importlib.import_module("jsonschema")
+    return jsonschema.Draft202012Validator(load_schema())
+
+
 def validate_output(data: dict) -> None:
     """Validate CLI output against schema.
 
+    Prefers a fastjsonschema-compiled validator, then jsonschema, then a minimal
+    built-in check. Validators are built once per process.
+
     Raises:
         ValueError: If the output does not conform to the schema.
     """
-    schema = load_schema()
+    compiled = _compiled_validator()
+    if compiled is not None:
+        fastjsonschema = importlib.import_module("fastjsonschema")
+        try:
+            compiled(data)
+        except fastjsonschema.JsonSchemaValueException as exc:
+            path = ".".join(str(part) for part in (exc.path or [])[1:]) or "<root>"
+            raise ValueError(f"Schema validation failed at {path}: {exc.message}") from exc
+        return
 
-    if importlib.util.find_spec("jsonschema") is None:
+    validator = _jsonschema_validator()
+    if validator is None:
         _validate_without_jsonschema(data)
         return
 
-    jsonschema = importlib.import_module("jsonschema")
-    validator = jsonschema.Draft202012Validator(schema)
-
     errors = sorted(validator.iter_errors(data), key=lambda err: list(err.path))
     if errors:
         first = errors[0]
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-import re
+from bisect import bisect_left, bisect_right
 from typing import Iterable
 
 from triage.normalize import NormalizedLine
 from triage.signals.progress import Marker
 
-_WATCHDOG_RE = re.compile(r"watchdog", re.IGNORECASE)
+# Categories, subcategories and rule ids come from the rulepacks, so this memo stays small.
+_WATCHDOG_MENTIONS: dict[str, bool] = {}
 _SUBSYSTEM_KEYWORDS: list[tuple[str, tuple[str, ...]]] = [
     ("memory", ("MRC", "DDR", "DIMM", "SPD")),
     ("pcie", ("PCIE",)),
@@ -19,25 +20,41 @@ _SUBSYSTEM_KEYWORDS: list[tuple[str, tuple[str, ...]]] = [
 ]
 
 
+def _mentions_watchdog(text: str) -> bool:
+    mentioned = _WATCHDOG_MENTIONS.get(text)
+    if mentioned is None:
+        mentioned = _WATCHDOG_MENTIONS[text] = "watchdog" in text.casefold()
+    return mentioned
+
+
 def _event_is_watchdog(event: dict) -> bool:
-    category = str(event.get("category", ""))
-    subcategory = str(event.get("subcategory", ""))
+    if _mentions_watchdog(str(event.get("category", ""))) or _mentions_watchdog(str(event.get("subcategory", ""))):
+        return True
     rule_hits = event.get("rule_hits")
-    rule_ids = []
-    if isinstance(rule_hits, list):
-        rule_ids = [str(rule_hit.get("rule_id", "")) for rule_hit in rule_hits if isinstance(rule_hit, dict)]
-    return bool(
-        _WATCHDOG_RE.search(category)
-        or _WATCHDOG_RE.search(subcategory)
-        or any("WATCHDOG" in rule_id.upper() for rule_id in rule_ids)
+    if not isinstance(rule_hits, list):
+        return False
+    return any(
+        _mentions_watchdog(str(rule_hit.get("rule_id", ""))) for rule_hit in rule_hits if isinstance(rule_hit, dict)
     )
 
 
-def _find_preceding_marker(markers: list[Marker], line_no: int, window: int = 2000) -> Marker | None:
-    candidates = [marker for marker in markers if marker["idx"] <= line_no and (line_no - marker["idx"]) <= window]
-    if not candidates:
+def _find_preceding_marker(
+    markers: list[Marker],
+    line_no: int,
+    window: int = 2000,
+    marker_lines: list[int] | None = None,
+) -> Marker | None:
+    """Return the first marker on the last marker line at or before ``line_no`` within ``window``.
+
+    ``markers`` must be in line order (as extractors produce them); pass ``marker_lines``
+    (their ``idx`` values) to reuse one index across lookups.
+    """
+    if marker_lines is None:
+        marker_lines = [marker["idx"] for marker in markers]
+    position = bisect_right(marker_lines, line_no) - 1
+    if position < 0 or line_no - marker_lines[position] > window:
         return None
-    return max(candidates, key=lambda marker: marker["idx"])
+    return markers[bisect_left(marker_lines, marker_lines[position], 0, position)]
 
 
 def _scan_text_for_subsystem(chunks: Iterable[str]) -> str | None:
@@ -58,20 +75,33 @@ def _event_context_text(event: dict, lines: list[NormalizedLine], line_no: int)
     if isinstance(hit_text, str):
         context.append(hit_text)
 
+    # Line numbers of a contiguous evidence window already in ``context``.
+    covered_start = covered_end = 0
     evidence = event.get("evidence")
     if isinstance(evidence, list) and evidence:
         first = evidence[0] if isinstance(evidence[0], dict) else None
         if isinstance(first, dict):
             evidence_lines = first.get("lines")
             if isinstance(evidence_lines, list):
-                for line in evidence_lines:
-                    if isinstance(line, dict) and isinstance(line.get("text"), str):
-                        context.append(line["text"])
-
+                texts = [
+                    line["text"] for line in evidence_lines if isinstance(line, dict) and isinstance(line.get("text"), str)
+                ]
+                context.extend(texts)
+                if texts and len(texts) == len(evidence_lines):
+                    first_idx = evidence_lines[0].get("idx")
+                    last_idx = evidence_lines[-1].get("idx")
+                    if isinstance(first_idx, int) and isinstance(last_idx, int) and last_idx - first_idx + 1 == len(texts):
+                        covered_start, covered_end = first_idx, last_idx
+
+    # Subsystem matching only asks whether a token appears, so lines the evidence
+    # window already contributed are not scanned again.
     start = max(1, line_no - 5)
     end = min(len(lines), line_no + 5)
+    if covered_start <= start and end <= covered_end:
+        return context
     for normalized in lines[start - 1 : end]:
-        context.append(normalized.text)
+        if not covered_start <= normalized.idx <= covered_end:
+            context.append(normalized.text)
 
     return context
 
@@ -83,6 +113,7 @@ def enrich_events(
     boot_blocking_event_id: str | None = None,
 ) -> None:
     """Enrich watchdog-like and boot-blocking events with deterministic extracted anchors."""
+    marker_lines: list[int] | None = None
     for event in events:
         is_target = _event_is_watchdog(event) or (
             isinstance(boot_blocking_event_id, str) and event.get("event_id") == boot_blocking_event_id
@@ -101,7 +132,9 @@ def enrich_events(
             extracted = {}
             event["extracted"] = extracted
 
-        marker = _find_preceding_marker(markers, line_no)
+        if marker_lines is None:
+            marker_lines = [marker["idx"] for marker in markers]
+        marker = _find_preceding_marker(markers, line_no, marker_lines=marker_lines)
         if marker is not None:
             if marker["kind"] == "progress":
                 extracted["last_progress_code"] = marker["value"]
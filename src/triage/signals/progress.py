@@ -18,34 +18,50 @@ class Marker(TypedDict):
     raw: str
 
 
-def extract_markers(lines: list[NormalizedLine]) -> list[Marker]:
-    """Extract deterministic progress markers from normalized lines."""
-    markers: list[Marker] = []
+class MarkerExtractor:
+    """Incremental progress/postcode marker extractor."""
 
-    for line in lines:
-        postcode_match = _POSTCODE_RE.search(line.text)
+    def __init__(self) -> None:
+        self.markers: list[Marker] = []
+
+    def feed(self, line: NormalizedLine) -> None:
+        """Append any markers found on a single line."""
+        text = line.text
+        # Both patterns are case-sensitive, so a substring test rules out most lines
+        # without running either regex.
+        postcode_match = _POSTCODE_RE.search(text) if "POSTCODE" in text else None
         if postcode_match:
-            markers.append(
+            self.markers.append(
                 {
                     "idx": line.idx,
                     "kind": "postcode",
                     "value": postcode_match.group("pc").upper(),
-                    "raw": line.text,
+                    "raw": text,
                 }
             )
 
-        progress_match = _PROGRESS_RE.search(line.text)
+        progress_match = _PROGRESS_RE.search(text) if "PROGRESS CODE:" in text else None
         if progress_match:
             progress_code = progress_match.group("code")
             suffix = progress_match.group("sfx")
             value = progress_code if suffix is None else f"{progress_code} {suffix}"
-            markers.append(
+            self.markers.append(
                 {
                     "idx": line.idx,
                     "kind": "progress",
                     "value": value,
-                    "raw": line.text,
+                    "raw": text,
                 }
             )
 
-    return markers
+    def finalize(self) -> list[Marker]:
+        """Return markers in line order."""
+        return self.markers
+
+
+def extract_markers(lines: list[NormalizedLine]) -> list[Marker]:
+    """Extract deterministic progress markers from normalized lines."""
+    extractor = MarkerExtractor()
+    for line in lines:
+        extractor.feed(line)
+    return extractor.finalize()
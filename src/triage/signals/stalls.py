@@ -43,14 +43,15 @@ def detect_stalls(
     stalls: list[StallSignal] = []
 
     for prev, current in zip(ordered_markers, ordered_markers[1:]):
-        phase = _phase_for_line(prev["idx"], phases)
-        if phase != _phase_for_line(current["idx"], phases):
-            continue
-
+        # Most consecutive markers are close together; only large gaps need a phase lookup.
         gap = current["idx"] - prev["idx"]
         if gap <= gap_lines:
             continue
 
+        phase = _phase_for_line(prev["idx"], phases)
+        if phase != _phase_for_line(current["idx"], phases):
+            continue
+
         stalls.append(
             {
                 "phase": phase,
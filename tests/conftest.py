@@ -5,4 +5,15 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_rule_cache(tmp_path, monkeypatch) -> None:
+    """Keep compiled-rule caches out of the user's cache directory and per-test."""
+    from triage.rules import cache
+
+    monkeypatch.setenv("BIOSLOGTRIAGE_CACHE_DIR", str(tmp_path / "rule-cache"))
+    monkeypatch.setattr(cache, "_MEMO", {})
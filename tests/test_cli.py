@@ -13,6 +13,26 @@ def test_cli_help_includes_input_flag() -> None:
     assert "--input" in help_text
 
 
+def test_cli_validate_flag_pair() -> None:
+    parser = cli.build_parser()
+
+    assert parser.parse_args(["--input", "x.log"]).validate is True
+    assert parser.parse_args(["--input", "x.log", "--no-validate"]).validate is False
+    assert parser.parse_args(["--input", "x.log", "--validate"]).validate is True
+
+
+def test_main_reuses_parser_across_calls(tmp_path, capsys) -> None:
+    log_file = tmp_path / "test.log"
+    log_file.write_text("Boot OK\n", encoding="utf-8")
+
+    cli.main(["--input", str(log_file)])
+    parser = cli._shared_parser()
+    cli.main(["--input", str(log_file), "--no-rules"])
+    capsys.readouterr()
+
+    assert cli._shared_parser() is parser
+
+
 def test_cli_outputs_stub_json(tmp_path, capsys) -> None:
     log_file = tmp_path / "test.log"
     log_file.write_text("Boot OK\nWARN: voltage low\nERROR: memory init failed\n", encoding="utf-8")
@@ -71,3 +91,71 @@ def test_cli_writes_evidence_jsonl_artifact(tmp_path, capsys) -> None:
     first = json.loads(lines[0])
     assert first["event_id"].startswith("evt-")
     assert {"ref", "start_line", "end_line", "lines"} <= set(first.keys())
+
+
+def test_cli_multiple_inputs_emit_ordered_list(tmp_path, capsys) -> None:
+    first = tmp_path / "first.log"
+    second = tmp_path / "second.log"
+    first.write_text("ASSERT: memory init failed\n", encoding="utf-8")
+    second.write_text("line1\nline2\nline3\n", encoding="utf-8")
+
+    exit_code = cli.main(["--input", str(first), str(second), "--jobs", "2"])
+
+    parsed = json.loads(capsys.readouterr().out)
+    assert exit_code == 0
+    assert isinstance(parsed, list)
+    assert [item["normalization"]["line_count"] for item in parsed] == [1, 3]
+    assert parsed[0]["events"]
+    assert parsed[1]["events"] == []
+
+
+def test_cli_multiple_inputs_scan_rules_in_process(tmp_path, capsys, monkeypatch) -> None:
+    from triage.rules import engine
+
+    requested_workers: list[int] = []
+    real_run_rules = engine.run_rules
+
+    def recording_run_rules(*args, **kwargs):
+        requested_workers.append(kwargs["workers"])
+        return real_run_rules(*args, **kwargs)
+
+    monkeypatch.setattr(engine, "run_rules", recording_run_rules)
+    first = tmp_path / "first.log"
+    second = tmp_path / "second.log"
+    first.write_text("ASSERT: memory init failed\n", encoding="utf-8")
+    second.write_text("line1\n", encoding="utf-8")
+
+    assert cli.main(["--input", str(first), "--rule-workers", "4"]) == 0
+    assert cli.main(["--input", str(first), str(second), "--jobs", "2", "--rule-workers", "4"]) == 0
+    capsys.readouterr()
+
+    assert requested_workers == [4, 1, 1]
+
+
+def test_cli_multiple_inputs_tag_evidence_records(tmp_path, capsys) -> None:
+    first = tmp_path / "first.log"
+    second = tmp_path / "second.log"
+    evidence_file = tmp_path / "evidence.jsonl"
+    first.write_text("ASSERT: memory init failed\n", encoding="utf-8")
+    second.write_text("line1\nASSERT: again\n", encoding="utf-8")
+
+    exit_code = cli.main(
+        ["--input", str(first), str(second), "--evidence-out", str(evidence_file)]
+    )
+
+    _ = capsys.readouterr()
+    records = [json.loads(line) for line in evidence_file.read_text(encoding="utf-8").splitlines()]
+    assert exit_code == 0
+    assert [record["input"] for record in records] == [str(first), str(second)]
+
+
+def test_cli_compact_output_is_single_line(tmp_path, capsys) -> None:
+    log_file = tmp_path / "test.log"
+    log_file.write_text("Boot OK\nERROR: memory init failed\n", encoding="utf-8")
+
+    exit_code = cli.main(["--input", str(log_file), "--compact"])
+
+    out = capsys.readouterr().out
+    assert exit_code == 0
+    assert out.count("\n") == 1
+    assert json.loads(out)["normalization"]["line_count"] == 2
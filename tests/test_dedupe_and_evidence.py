@@ -51,3 +51,74 @@ def test_no_evidence_omits_evidence_lines(capsys) -> None:
     validate_output(payload)
     evidence = payload["events"][0]["evidence"][0]
     assert "lines" not in evidence
+
+
+def test_boot_blocking_selection_prefers_score_then_earliest_line() -> None:
+    def _event(event_id: str, severity: str, start: int, phase: str = "PEI") -> dict:
+        return {
+            "event_id": event_id,
+            "severity": severity,
+            "confidence": 0.9,
+            "boot_blocking": True,
+            "where": {"phase": phase, "line_range": {"start": start, "end": start}},
+        }
+
+    events = [
+        _event("evt-1", "high", 5),
+        _event("evt-2", "fatal", 40),
+        _event("evt-3", "fatal", 20),
+        _event("evt-4", "fatal", 20),
+        {"event_id": "evt-5", "severity": "fatal", "confidence": 1.0, "boot_blocking": False},
+    ]
+
+    assert cli._select_boot_blocking_event_id(events) == "evt-3"
+    assert cli._select_boot_blocking_event_id(events[4:]) is None
+
+
+def test_duplicate_hits_do_not_build_evidence(monkeypatch) -> None:
+    from triage.normalize import load_and_normalize
+    from triage.phases import build_segments, detect_phases
+    from triage.rules import engine
+    from triage.rules.engine import compile_rules, run_rules
+    from triage.rules.loader import load_rulepack
+
+    lines = load_and_normalize("fixtures/synthetic_logs/repeats_minimal.log")
+    segments = build_segments(lines, detect_phases(lines))
+    rules = compile_rules(load_rulepack("src/triage/rulepacks/faults_v1.yaml"))
+
+    calls: list[int] = []
+    original = engine._event_evidence
+
+    def _counting(**kwargs):
+        calls.append(kwargs["hit_line"])
+        return original(**kwargs)
+
+    monkeypatch.setattr(engine, "_event_evidence", _counting)
+    events = run_rules(lines, segments, rules, context_lines=1)
+
+    assert len(calls) == len(events)
+    assert any(event["occurrences"] > 1 for event in events)
+
+
+def test_fingerprint_groups_by_category_keyword() -> None:
+    from triage.fingerprint import stable_event_fingerprint
+
+    def group(category: str, extracted: dict) -> str:
+        return stable_event_fingerprint({"category": category, "extracted": extracted})["dedupe_group"]
+
+    assert group("fault.assert", {"module": "M", "file": "f.c", "line": 3}) == "assert:M:f.c:3"
+    assert group("fault.reset_cause", {"cause": "wdt"}) == "reset:wdt"
+    assert group("fault.watchdog", {}).startswith("watchdog:")
+    assert group("pcie.enum", {}).startswith("pcie.enum:")
+    # Memoized lookups give the same answer on repeat calls.
+    assert group("fault.reset_cause", {"cause": "wdt"}) == "reset:wdt"
+
+
+def test_fingerprint_hit_text_argument_matches_private_key() -> None:
+    from triage.fingerprint import stable_event_fingerprint
+
+    event = {"category": "pcie.enum", "severity": "high", "extracted": {"bdf": "00:1c.0"}}
+
+    assert stable_event_fingerprint(event, "link down on 00:1c.0") == stable_event_fingerprint(
+        {**event, "_normalized_hit_text": "link down on 00:1c.0"}
+    )
@@ -4,9 +4,10 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
+from typing import Iterator
 
 from triage import cli
-from triage.llm.evidence_pack import build_evidence_pack
+from triage.llm.evidence_pack import build_evidence_pack, rank_events
 
 
 class _FakeResponse:
@@ -15,8 +16,11 @@ class _FakeResponse:
         self._payload = payload if payload is not None else {"response": '{"ok": true}'}
         self.text = text
 
-    def json(self) -> object:
-        return self._payload
+    def iter_lines(self) -> Iterator[bytes]:
+        yield json.dumps({**self._payload, "done": True}).encode("utf-8")
+
+    def close(self) -> None:
+        pass
 
 
 def _make_event(event_id: str, severity: str, confidence: float, lines_count: int, *, boot_blocking: bool = False) -> dict:
@@ -170,3 +174,94 @@ def test_build_evidence_pack_hit_line_invariant_under_trimming() -> None:
         assert len(lines) >= 1
         assert lines[0]["idx"] == event["where"]["line_range"]["start"]
         assert lines[0]["text"]
+
+
+def test_rank_events_scores_severity_case_insensitively() -> None:
+    events = [
+        {"event_id": "evt-low", "severity": "low", "confidence": 0.5},
+        {"event_id": "evt-upper", "severity": "HIGH", "confidence": 0.5},
+        {"event_id": "evt-mixed", "severity": "fAtAl", "confidence": 0.5},
+        {"event_id": "evt-none", "severity": None, "confidence": 0.5},
+    ]
+
+    assert [event["event_id"] for event in rank_events(events)] == ["evt-mixed", "evt-upper", "evt-low", "evt-none"]
+
+
+def test_build_evidence_pack_tracked_size_matches_serialization() -> None:
+    output = {
+        "schema_version": "0.1.0",
+        "events": [_make_event(f"evt-{idx}", "high", 0.5 + idx / 100, 3) for idx in range(6)],
+    }
+
+    for max_chars in (500, 1500, 2500, 4000, 30000):
+        pack = build_evidence_pack(output, top_k=6, max_chars=max_chars)
+        meta = dict(pack["evidence_pack_meta"])
+        if meta["trimming_applied"] == ["meta_compacted"]:
+            continue  # over budget even with one event; final_chars is re-measured including itself
+        final_chars = meta.pop("final_chars")
+        unsized = {**pack, "evidence_pack_meta": meta}
+
+        assert final_chars == len(json.dumps(unsized, separators=(",", ":"), ensure_ascii=False))
+
+
+def test_build_evidence_pack_leaves_source_events_untouched() -> None:
+    import copy
+
+    event = _make_event("evt-1", "fatal", 0.9, 5, boot_blocking=True)
+    event["where"]["line_range"] = {"start": 3, "end": 3}
+    output = {"schema_version": "0.1.0", "events": [event, _make_event("evt-2", "low", 0.2, 5)]}
+    before = copy.deepcopy(output)
+
+    pack = build_evidence_pack(output, top_k=2, max_chars=30000)
+
+    assert output == before
+    assert pack["selected_events"][0]["evidence"][0]["lines"] == [{"idx": 3, "text": "X" * 250}]
+
+
+def test_build_evidence_pack_selection_matches_full_ranking_on_ties() -> None:
+    events = [_make_event(f"evt-{idx}", ("high", "low")[idx % 2], 0.5, 1) for idx in range(12)]
+    expected = [event["event_id"] for event in rank_events(events)]
+
+    for top_k in (0, 1, 3, 20):
+        pack = build_evidence_pack({"events": events}, top_k=top_k, max_chars=10**6)
+        assert [event["event_id"] for event in pack["selected_events"]] == expected[: max(1, top_k)]
+
+
+def test_ensure_hit_line_is_not_reported_when_already_reduced() -> None:
+    event = _make_event("evt-1", "fatal", 0.9, 1)
+    event["where"]["line_range"] = {"start": 1, "end": 1}
+    other = _make_event("evt-2", "high", 0.9, 3)
+
+    pack = build_evidence_pack({"events": [event, other]}, top_k=2, max_chars=10**6)
+
+    assert pack["evidence_pack_meta"]["trimming_applied"] == ["ensured_hit_line:event_index=1"]
+    assert pack["selected_events"][0]["evidence"][0]["lines"] == [{"idx": 1, "text": "X" * 250}]
+
+
+def test_trimming_meta_lists_first_entries_and_counts_all() -> None:
+    events = [_make_event(f"evt-{idx}", "high", 0.5, 1) for idx in range(20)]
+    for event in events:
+        event["where"]["line_range"] = {"start": 1, "end": 1}
+
+    pack = build_evidence_pack({"events": events}, top_k=20, max_chars=2500)
+    meta = pack["evidence_pack_meta"]
+
+    dropped = 20 - meta["events_included"]
+    assert dropped > 12
+    assert meta["trimming_count"] == dropped
+    assert meta["trimming_applied"] == ["dropped_low_ranked_event"] * 12
+
+
+def test_ensure_hit_line_finds_hit_in_window_or_unordered_lines() -> None:
+    windowed = _make_event("evt-1", "high", 0.9, 5)
+    windowed["where"]["line_range"] = {"start": 4, "end": 4}
+    windowed["evidence"][0]["lines"][3]["text"] = "hit"
+    unordered = _make_event("evt-2", "high", 0.9, 5)
+    unordered["where"]["line_range"] = {"start": 2, "end": 2}
+    unordered["evidence"][0]["lines"].reverse()
+    unordered["evidence"][0]["lines"][3]["text"] = "hit-2"
+
+    pack = build_evidence_pack({"events": [windowed, unordered]}, top_k=2, max_chars=10**6)
+
+    lines_by_id = {event["event_id"]: event["evidence"][0]["lines"] for event in pack["selected_events"]}
+    assert lines_by_id == {"evt-1": [{"idx": 4, "text": "hit"}], "evt-2": [{"idx": 2, "text": "hit-2"}]}
@@ -0,0 +1,47 @@
+"""JSON helper tests for orjson and stdlib fallback paths."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from triage import _json
+
+_PAYLOAD = {"event_id": "evt-1", "text": "µ-code DIMM", "lines": [{"idx": 1}], "ok": True, "conf": 0.5}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_helpers_round_trip(monkeypatch, use_orjson: bool) -> None:
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(_json, "orjson", None)
+
+    compact = _json.dumps(_PAYLOAD)
+
+    assert json.loads(compact) == _PAYLOAD
+    assert json.loads(_json.dumps_pretty(_PAYLOAD)) == _PAYLOAD
+    assert "\n  " in _json.dumps_pretty(_PAYLOAD)
+    assert compact == json.dumps(_PAYLOAD, ensure_ascii=False, separators=(",", ":"))
+    assert _json.size_bytes(_PAYLOAD) == len(compact.encode("utf-8"))
+    assert _json.size_chars(_PAYLOAD) == len(compact)
+    assert _json.loads(compact.encode("utf-8")) == _PAYLOAD
+    with pytest.raises(json.JSONDecodeError):
+        _json.loads("{not json")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_iter_pretty_matches_dumps_pretty(monkeypatch, use_orjson: bool) -> None:
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(_json, "orjson", None)
+
+    document = [{"events": [_PAYLOAD, {"nested": {"a": [], "b": {}}}], "empty": [], "n": None}, {}, []]
+
+    for value in (_PAYLOAD, document, [], {}, "text", 3):
+        for depth in (0, 1, 3):
+            assert "".join(_json.iter_pretty(value, max_depth=depth)) == _json.dumps_pretty(value)
+            assert "".join(_json.iter_compact(value, max_depth=depth)) == _json.dumps(value)
+            assert b"".join(_json.iter_pretty_bytes(value, max_depth=depth)) == _json.dumps_pretty_bytes(value)
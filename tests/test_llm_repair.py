@@ -1,5 +1,8 @@
 """Tests for deterministic llm_synthesis repair/coercion."""
 
+import pytest
+
+from triage import cli
 from triage.cli import _validate_llm_facts, _validate_llm_synthesis
 from triage.llm.repair import repair_llm_synthesis
 from triage.llm.repair_facts import repair_llm_facts
@@ -66,6 +69,22 @@ def test_repair_llm_facts_drops_empty_fact_items_and_validates() -> None:
     assert repaired["facts"] == []
     _validate_llm_facts(repaired)
 
+def test_repair_llm_facts_clamps_numeric_and_string_confidences() -> None:
+    candidate = {
+        "overall_grounding_confidence": float("nan"),
+        "facts": [
+            {"fact": f"fact {index}", "supporting_event_ids": ["evt-1"], "confidence": confidence}
+            for index, confidence in enumerate((1.7, -2, True, "0.4", "high", None, 0.25))
+        ],
+    }
+
+    repaired = repair_llm_facts(candidate)
+
+    assert repaired["overall_grounding_confidence"] == 0.2
+    assert [fact["confidence"] for fact in repaired["facts"]] == [1.0, 0.0, 1.0, 0.4, 0.3, 0.3, 0.25]
+    assert all(type(fact["confidence"]) is float for fact in repaired["facts"])
+    _validate_llm_facts(repaired)
+
 def test_repair_recommended_actions_complete_required_fields_and_validate() -> None:
     candidate = {
         "overall_confidence": 0.5,
@@ -86,3 +105,64 @@ def test_repair_recommended_actions_complete_required_fields_and_validate() -> N
         }
     ]
     _validate_llm_synthesis(repaired)
+
+
+@pytest.mark.parametrize("backend", ["fastjsonschema", "jsonschema"])
+def test_llm_facts_validation_error_path_is_backend_independent(monkeypatch, backend: str) -> None:
+    pytest.importorskip(backend)
+    if backend == "jsonschema":
+        monkeypatch.setattr(cli, "_compiled_llm_validator", lambda schema_name: None)
+
+    candidate = {
+        "overall_grounding_confidence": 0.5,
+        "facts": [{"fact": "", "supporting_event_ids": ["evt-1"], "confidence": 0.5}],
+    }
+
+    with pytest.raises(ValueError, match=r"llm_facts validation failed at facts\.0\.fact"):
+        _validate_llm_facts(candidate)
+
+
+def test_jsonschema_validator_is_built_once() -> None:
+    pytest.importorskip("jsonschema")
+
+    first = cli._jsonschema_llm_validator("llm_synthesis")
+
+    assert first is not None
+    assert cli._jsonschema_llm_validator("llm_synthesis") is first
+
+
+def test_llm_validation_memoizes_equal_payloads(monkeypatch) -> None:
+    monkeypatch.setattr(cli, "_VALIDATED_LLM_PAYLOADS", type(cli._VALIDATED_LLM_PAYLOADS)())
+    calls: list[str] = []
+    original = cli._check_llm_payload
+
+    def _counting(payload: dict, schema: dict, label: str) -> None:
+        calls.append(label)
+        original(payload, schema, label)
+
+    monkeypatch.setattr(cli, "_check_llm_payload", _counting)
+    facts = {
+        "overall_grounding_confidence": 0.5,
+        "facts": [{"fact": "DIMM A1 failed SPD read", "supporting_event_ids": ["evt-1"], "confidence": 0.5}],
+    }
+
+    _validate_llm_facts(facts)
+    _validate_llm_facts({key: facts[key] for key in reversed(list(facts))})
+
+    assert calls == ["llm_facts"]
+
+
+def test_repair_llm_synthesis_fills_missing_keys_after_model_keys() -> None:
+    first = repair_llm_synthesis({"executive_summary": "spd read failed"}, "evt-1")
+    first["missing_evidence"].append({"need": "x"})
+    second = repair_llm_synthesis({}, "evt-1")
+
+    assert list(first) == [
+        "executive_summary",
+        "overall_confidence",
+        "root_cause_hypotheses",
+        "recommended_next_actions",
+        "missing_evidence",
+    ]
+    assert first["overall_confidence"] == 0.2
+    assert second["missing_evidence"] == []
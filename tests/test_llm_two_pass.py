@@ -100,3 +100,52 @@ def test_llm_two_pass_invalid_facts_falls_back_and_continues(monkeypatch, capsys
     assert "errors" not in data["llm_facts"]
     assert data["llm_synthesis"]["overall_confidence"] == 0.2
     validate_output(data)
+
+
+def test_trim_llm_facts_to_budget_keeps_longest_fitting_prefix() -> None:
+    from triage import _json
+
+    llm_facts = {
+        "overall_grounding_confidence": 0.5,
+        "facts": [
+            {"fact": f"Fact number {idx} " + "x" * idx, "supporting_event_ids": ["evt-1"], "confidence": 0.5}
+            for idx in range(40)
+        ],
+        "errors": [],
+    }
+
+    for budget in (10, 60, 200, 1000, 2500):
+        trimmed = cli._trim_llm_facts_to_budget(llm_facts, budget)
+        keep = len(trimmed["facts"])
+        assert trimmed["facts"] == llm_facts["facts"][:keep]
+        assert "errors" not in trimmed
+        if keep:
+            assert _json.size_bytes(trimmed) <= budget
+        if keep < len(llm_facts["facts"]):
+            longer = {**trimmed, "facts": llm_facts["facts"][: keep + 1]}
+            assert _json.size_bytes(longer) > budget
+
+
+def test_llm_two_pass_dump_prompt_contains_both_passes(monkeypatch, capsys, tmp_path) -> None:
+    fixture_path = Path("fixtures/synthetic_logs/minimal_boot.log")
+    dump_path = tmp_path / "prompt.txt"
+    calls = iter(
+        [
+            {"overall_grounding_confidence": 0.5, "facts": []},
+            {"overall_confidence": 0.1, "executive_summary": "n/a"},
+        ]
+    )
+
+    monkeypatch.setattr(
+        "triage.llm.ollama_client.OllamaClient.generate_json",
+        lambda self, system, user, schema: next(calls),
+    )
+
+    exit_code = cli.main(["--input", str(fixture_path), "--llm", "--dump-llm-prompt", str(dump_path)])
+
+    _ = capsys.readouterr()
+    dumped = dump_path.read_text(encoding="utf-8")
+    assert exit_code == 0
+    assert dumped.startswith("# PASS1 FACTS\n")
+    assert dumped.count("# PASS1 FACTS") == 1
+    assert "# PASS2 SYNTHESIS\n" in dumped
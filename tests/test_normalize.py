@@ -0,0 +1,59 @@
+"""Log normalization tests."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from triage.ingest import read_log
+from triage.normalize import iter_normalized, load_and_normalize
+
+
+def _text_mode_lines(path: Path) -> list[str]:
+    with open(path, "r", encoding="utf-8", errors="replace") as handle:
+        return list(handle)
+
+
+def test_load_and_normalize_matches_text_mode_line_splitting(tmp_path) -> None:
+    log_file = tmp_path / "mixed.log"
+    log_file.write_bytes(b"SecCore\r\nPEI \x1b[31mred\x1b[0m\rlone-cr\n\xffbad byte\n\nlast line no newline")
+
+    lines = load_and_normalize(str(log_file))
+
+    assert [line.raw for line in lines] == _text_mode_lines(log_file)
+    assert [line.idx for line in lines] == list(range(1, 7))
+    assert lines[1].text == "PEI red"
+    assert lines[-1].text == "last line no newline"
+
+
+def test_load_and_normalize_empty_file(tmp_path) -> None:
+    log_file = tmp_path / "empty.log"
+    log_file.write_bytes(b"")
+
+    assert load_and_normalize(str(log_file)) == []
+
+
+def test_iter_normalized_is_lazy() -> None:
+    fixture_path = Path("fixtures/synthetic_logs/progress_stall_watchdog.log")
+
+    first = next(iter_normalized(str(fixture_path)))
+
+    assert first.idx == 1
+
+
+def test_read_log_matches_read_text(tmp_path) -> None:
+    log_file = tmp_path / "crlf.log"
+    log_file.write_bytes("SecCore\r\nPEI \u00b5code\rDXE\nlast".encode("utf-8"))
+    empty_file = tmp_path / "empty.log"
+    empty_file.write_bytes(b"")
+
+    assert read_log(str(log_file)) == log_file.read_text(encoding="utf-8")
+    assert read_log(str(empty_file)) == ""
+
+
+def test_normalize_line_strips_escapes_controls_and_odd_whitespace() -> None:
+    from triage.normalize import _normalize_line
+
+    assert _normalize_line("\x1b[1;31mFAIL\x1b[0m\x07 code\r\n") == "FAIL code"
+    assert _normalize_line("a\x1b\x00[31mb") == "ab"
+    assert _normalize_line("\x1b\x01[31m") == "[31m"
+    assert _normalize_line(" DXE 　Core ") == "DXE Core"
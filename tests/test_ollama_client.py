@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import json
+from typing import Iterator
 from unittest.mock import patch
 
 import pytest
@@ -15,10 +17,12 @@ class _FakeResponse:
         self._payload = payload
         self.text = text
 
-    def json(self) -> object:
-        if isinstance(self._payload, Exception):
-            raise self._payload
-        return self._payload
+    def iter_lines(self) -> Iterator[bytes]:
+        # A single-chunk NDJSON stream, as Ollama sends for short generations.
+        yield json.dumps({**self._payload, "done": True}).encode("utf-8")
+
+    def close(self) -> None:
+        pass
 
 
 def test_generate_json_posts_expected_payload() -> None:
@@ -37,8 +41,9 @@ def test_generate_json_posts_expected_payload() -> None:
             "model": "qwen2.5:7b",
             "prompt": "usr",
             "system": "sys",
-            "stream": False,
+            "stream": True,
             "format": "json",
+            "keep_alive": "10m",
         },
         60,
         "qwen2.5:7b",
@@ -59,7 +64,7 @@ def test_generate_json_invalid_json_raises() -> None:
 def test_post_read_timeout_has_actionable_message() -> None:
     requests = pytest.importorskip("requests")
 
-    with patch("requests.post", side_effect=requests.ReadTimeout("slow")):
+    with patch("requests.Session.post", side_effect=requests.ReadTimeout("slow")):
         with pytest.raises(RuntimeError, match="llm-max-chars") as exc:
             _post(
                 "http://localhost:11434/api/generate",
@@ -72,3 +77,72 @@ def test_post_read_timeout_has_actionable_message() -> None:
     assert "model=qwen2.5:3b" in msg
     assert "timeout_s=123" in msg
     assert "prompt_chars=60" in msg
+
+
+def test_post_reuses_keep_alive_session_per_origin() -> None:
+    pytest.importorskip("requests")
+    from triage.llm.ollama_client import _session_for
+
+    first = _session_for("http://localhost:11434/api/generate")
+    second = _session_for("http://localhost:11434/api/tags")
+    other = _session_for("http://127.0.0.1:11434/api/generate")
+
+    assert first is second
+    assert first is not other
+
+
+def test_generate_json_omits_keep_alive_when_disabled() -> None:
+    client = OllamaClient(host="http://localhost:11434", model="qwen2.5:7b", keep_alive=None)
+
+    with patch(
+        "triage.llm.ollama_client._post",
+        return_value=_FakeResponse(payload={"response": '{"ok": true}'}),
+    ) as post:
+        client.generate_json(system="sys", user="usr", schema={"type": "object"})
+
+    assert "keep_alive" not in post.call_args.args[1]
+
+
+class _FakeStream:
+    def __init__(self, chunks: list[dict]) -> None:
+        self.status_code = 200
+        self.text = ""
+        self.closed = False
+        self._chunks = chunks
+
+    def iter_lines(self) -> Iterator[bytes]:
+        for chunk in self._chunks:
+            yield json.dumps(chunk).encode("utf-8")
+            yield b""
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_generate_json_joins_streamed_fragments() -> None:
+    client = OllamaClient(host="http://localhost:11434", model="qwen2.5:7b")
+    stream = _FakeStream(
+        [
+            {"response": '{"root_cause"', "done": False},
+            {"response": ': "spd", ', "done": False},
+            {"response": '"ok": true}', "done": False},
+            {"response": "", "done": True, "eval_count": 3},
+        ]
+    )
+
+    with patch("triage.llm.ollama_client._post", return_value=stream):
+        out = client.generate_json(system="sys", user="usr", schema={"type": "object"})
+
+    assert out == {"root_cause": "spd", "ok": True}
+    assert stream.closed
+
+
+def test_generate_json_surfaces_mid_stream_error() -> None:
+    client = OllamaClient(host="http://localhost:11434", model="qwen2.5:7b")
+    stream = _FakeStream([{"response": "{", "done": False}, {"error": "model unloaded"}])
+
+    with patch("triage.llm.ollama_client._post", return_value=stream):
+        with pytest.raises(RuntimeError, match="model unloaded"):
+            client.generate_json(system="sys", user="usr", schema={"type": "object"})
+
+    assert stream.closed
@@ -62,3 +62,35 @@ def test_apply_output_mode_tiny_removes_lines() -> None:
     assert evidence["ref"] == "log:seg-1:100-120"
     assert evidence_records[0]["start_line"] == 100
     validate_output(shaped)
+
+
+def test_apply_output_mode_leaves_input_untouched_and_shares_other_sections() -> None:
+    output = _sample_output()
+
+    shaped, _ = apply_output_mode(output, "tiny")
+
+    assert "lines" in output["events"][0]["evidence"][0]
+    assert "lines" not in shaped["events"][0]["evidence"][0]
+    assert shaped["boot_timeline"] is output["boot_timeline"]
+
+
+def test_apply_output_mode_slim_finds_hit_line_outside_window_order() -> None:
+    output = _sample_output()
+    output["events"][0]["evidence"][0]["lines"].reverse()
+
+    shaped, _ = apply_output_mode(output, "slim")
+
+    assert shaped["events"][0]["evidence"][0]["lines"] == [{"idx": 101, "text": "ERROR memory init failed"}]
+
+
+def test_apply_output_mode_slim_keeps_records_for_dict_subclass_events() -> None:
+    from collections import OrderedDict
+
+    output = _sample_output()
+    output["events"] = [OrderedDict(output["events"][0])]
+
+    shaped, evidence_records = apply_output_mode(output, "slim")
+
+    assert shaped["events"][0]["evidence"][0]["lines"] == [{"idx": 101, "text": "ERROR memory init failed"}]
+    assert [record["event_id"] for record in evidence_records] == ["evt-1"]
+    assert len(evidence_records[0]["lines"]) == 3
@@ -33,3 +33,17 @@ def test_detect_phases_start_end_lines_and_confidence() -> None:
     assert spans[3].end_line == 14
 
     assert all(span.confidence >= 0.8 for span in spans)
+
+
+def test_detect_phases_counts_every_matching_marker_on_a_line() -> None:
+    from triage.normalize import NormalizedLine
+
+    texts = ["noise", "PeiCore PEI services ready", "unrelated driver load", "dxe phase"]
+    lines = [NormalizedLine(idx=idx, raw=text, text=text) for idx, text in enumerate(texts, start=1)]
+
+    spans = detect_phases(lines)
+
+    assert [(span.phase, span.start_line, span.end_line, span.confidence) for span in spans] == [
+        ("PEI", 2, 3, 0.98),
+        ("DXE", 4, 4, 0.8),
+    ]
@@ -0,0 +1,27 @@
+"""Fused scan pipeline tests."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from triage.normalize import iter_normalized, load_and_normalize, normalization_stats
+from triage.phases import build_segments, detect_phases
+from triage.pipeline import scan_once
+from triage.signals.progress import extract_markers
+from triage.signals.stalls import detect_stalls
+
+
+def test_scan_once_matches_individual_passes() -> None:
+    fixture_path = str(Path("fixtures/synthetic_logs/progress_stall_watchdog.log"))
+    lines = load_and_normalize(fixture_path)
+    phases = detect_phases(lines)
+    markers = extract_markers(lines)
+
+    scan = scan_once(iter_normalized(fixture_path))
+
+    assert scan.lines == lines
+    assert scan.phases == phases
+    assert scan.segments == build_segments(lines, phases)
+    assert scan.markers == markers
+    assert scan.stalls == detect_stalls(markers, phases)
+    assert scan.normalization == normalization_stats(lines)
@@ -79,3 +79,80 @@ def test_watchdog_enrichment_includes_progress_or_postcode_and_subsystem(capsys)
     extracted = target_events[0]["extracted"]
     assert extracted.get("last_progress_code") or extracted.get("postcode_hex")
     assert extracted.get("suspected_subsystem") == "memory"
+
+
+def test_last_marker_per_segment_sweep() -> None:
+    from triage.phases import Segment
+
+    segments = [
+        Segment(segment_id="seg-1", start_line=1, end_line=10, phases=[]),
+        Segment(segment_id="seg-2", start_line=11, end_line=20, phases=[]),
+        Segment(segment_id="seg-3", start_line=21, end_line=30, phases=[]),
+    ]
+    markers = [
+        {"idx": 12, "kind": "progress", "value": "B", "raw": ""},
+        {"idx": 3, "kind": "postcode", "value": "A", "raw": ""},
+        {"idx": 18, "kind": "postcode", "value": "C", "raw": ""},
+    ]
+
+    last = cli._last_marker_per_segment(segments, markers)
+
+    assert [marker["value"] if marker else None for marker in last] == ["A", "C", None]
+
+
+def test_find_preceding_marker_picks_first_marker_on_nearest_line() -> None:
+    from triage.signals.enrich_events import _find_preceding_marker
+
+    markers = [
+        {"idx": 3, "kind": "progress", "value": "A", "raw": ""},
+        {"idx": 10, "kind": "postcode", "value": "0000DB03", "raw": ""},
+        {"idx": 10, "kind": "progress", "value": "B", "raw": ""},
+        {"idx": 50, "kind": "progress", "value": "C", "raw": ""},
+    ]
+
+    assert _find_preceding_marker(markers, 2) is None
+    assert _find_preceding_marker(markers, 3) is markers[0]
+    assert _find_preceding_marker(markers, 49) is markers[1]
+    assert _find_preceding_marker(markers, 49, marker_lines=[3, 10, 10, 50]) is markers[1]
+    assert _find_preceding_marker(markers, 60, window=5) is None
+    assert _find_preceding_marker([], 60) is None
+
+
+def test_marker_extractor_reads_postcode_and_progress_on_one_line() -> None:
+    from triage.normalize import NormalizedLine
+    from triage.signals.progress import extract_markers
+
+    texts = ["PROGRESS CODE: V03040003 I0 POSTCODE = <0000db03>", "progress code: lower", "plain line"]
+    lines = [NormalizedLine(idx=index, raw=text, text=text) for index, text in enumerate(texts, start=1)]
+
+    markers = extract_markers(lines)
+
+    assert [(marker["idx"], marker["kind"], marker["value"]) for marker in markers] == [
+        (1, "postcode", "0000DB03"),
+        (1, "progress", "V03040003 I0"),
+    ]
+
+
+def test_event_is_watchdog_checks_category_subcategory_and_rule_ids() -> None:
+    from triage.signals.enrich_events import _event_is_watchdog
+
+    assert _event_is_watchdog({"category": "platform.WatchDog"})
+    assert _event_is_watchdog({"category": "c", "subcategory": "wdt_watchdog_expired"})
+    assert _event_is_watchdog({"category": "c", "subcategory": None, "rule_hits": [{"rule_id": "R_WATCHDOG_001"}]})
+    assert not _event_is_watchdog({"category": "c", "subcategory": None, "rule_hits": [{"rule_id": "R_PCIE_001"}, "x"]})
+    assert not _event_is_watchdog({"category": "c", "rule_hits": None})
+
+
+def test_event_context_text_skips_lines_covered_by_evidence() -> None:
+    from triage.normalize import NormalizedLine
+    from triage.signals.enrich_events import _event_context_text
+
+    lines = [NormalizedLine(idx=index, raw=f"l{index}", text=f"l{index}") for index in range(1, 21)]
+    window = [{"idx": index, "text": f"l{index}"} for index in range(8, 13)]
+    event = {"hit_text": "l10", "evidence": [{"lines": window}]}
+
+    context = _event_context_text(event, lines, 10)
+    assert context == ["l10", "l8", "l9", "l10", "l11", "l12", "l5", "l6", "l7", "l13", "l14", "l15"]
+
+    gappy = {"hit_text": "l10", "evidence": [{"lines": [window[0], window[-1]]}]}
+    assert _event_context_text(gappy, lines, 10) == ["l10", "l8", "l12"] + [f"l{index}" for index in range(5, 16)]
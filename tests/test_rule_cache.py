@@ -0,0 +1,98 @@
+"""Compiled rulepack cache tests."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import shutil
+
+import pytest
+
+from triage.rules import cache
+from triage.rules.cache import load_compiled_cached
+
+_FAULTS = Path("src/triage/rulepacks/faults_v1.yaml")
+
+
+def test_cache_hit_skips_rulepack_loading(tmp_path, monkeypatch) -> None:
+    first = load_compiled_cached([str(_FAULTS)])
+    assert list((tmp_path / "rule-cache").glob("rules-*.pkl"))
+
+    def _fail(path: str) -> dict:
+        raise AssertionError("rulepack should come from cache")
+
+    monkeypatch.setattr(cache, "load_rulepack", _fail)
+    cache._MEMO.clear()
+    second = load_compiled_cached([str(_FAULTS)])
+
+    assert [rule.id for rule in second] == [rule.id for rule in first]
+    assert second[0].pattern.pattern == first[0].pattern.pattern
+
+
+def test_cache_invalidates_on_rulepack_edit(tmp_path) -> None:
+    rulepack = tmp_path / "pack.yaml"
+    shutil.copy(_FAULTS, rulepack)
+    original = load_compiled_cached([str(rulepack)])
+    cache._MEMO.clear()
+
+    rulepack.write_text(
+        '{"version": "1.0", "rules": [{"id": "R_X", "category": "fault.x", "severity": "low", '
+        '"confidence": 0.5, "regex": "X", "required_phase": null}]}',
+        encoding="utf-8",
+    )
+    edited = load_compiled_cached([str(rulepack)])
+
+    assert len(original) > 1
+    assert [rule.id for rule in edited] == ["R_X"]
+
+
+def test_corrupt_cache_entry_falls_back_to_compile(tmp_path) -> None:
+    load_compiled_cached([str(_FAULTS)])
+    for entry in (tmp_path / "rule-cache").glob("rules-*.pkl"):
+        entry.write_bytes(b"not a pickle")
+    cache._MEMO.clear()
+
+    rules = load_compiled_cached([str(_FAULTS)])
+
+    assert rules
+
+
+def test_parallel_compile_preserves_rulepack_order(monkeypatch) -> None:
+    monkeypatch.setenv("BIOSLOGTRIAGE_NO_CACHE", "1")
+    paths = sorted(str(path) for path in Path("src/triage/rulepacks").glob("*.yaml"))
+
+    combined = load_compiled_cached(paths)
+
+    expected = [rule.id for path in paths for rule in load_compiled_cached([path])]
+    assert [rule.id for rule in combined] == expected
+
+
+def test_in_process_memo_skips_disk_cache(tmp_path, monkeypatch) -> None:
+    first = load_compiled_cached([str(_FAULTS)])
+    for entry in (tmp_path / "rule-cache").glob("rules-*.pkl"):
+        entry.unlink()
+
+    monkeypatch.setattr(cache, "_read_cache", lambda path: pytest.fail("memo should answer first"))
+    second = load_compiled_cached([str(_FAULTS)])
+
+    assert [rule.id for rule in second] == [rule.id for rule in first]
+    assert second is not first
+
+
+def test_cache_key_tracks_compile_code(monkeypatch) -> None:
+    original = cache._cache_key([str(_FAULTS)])
+
+    monkeypatch.setattr(cache, "_code_digest", lambda: "edited-engine")
+
+    assert cache._cache_key([str(_FAULTS)]) != original
+
+
+def test_cache_entry_with_other_rule_layout_is_ignored(tmp_path) -> None:
+    import pickle
+
+    rules = load_compiled_cached([str(_FAULTS)])
+    entry = tmp_path / "stale.pkl"
+    entry.write_bytes(pickle.dumps({"format": cache._CACHE_FORMAT, "fields": ("id", "pattern"), "rules": rules}))
+    assert cache._read_cache(entry) is None
+
+    entry.write_bytes(pickle.dumps({"format": cache._CACHE_FORMAT, "fields": cache._RULE_FIELDS, "rules": rules}))
+    assert [rule.id for rule in cache._read_cache(entry)] == [rule.id for rule in rules]
@@ -24,3 +24,253 @@ def test_fault_rulepack_emits_expected_events(capsys) -> None:
         for event in payload["events"]
     )
     validate_output(payload)
+
+
+def test_combined_prefilter_matches_python_engine_on_all_fixtures() -> None:
+    from triage.normalize import load_and_normalize
+    from triage.phases import build_segments, detect_phases
+    from triage.rules.engine import compile_rules, run_rules
+    from triage.rules.loader import load_rulepack
+
+    rules = []
+    for rulepack_path in sorted(Path("src/triage/rulepacks").glob("*.yaml")):
+        rules.extend(compile_rules(load_rulepack(str(rulepack_path))))
+
+    for fixture_path in sorted(Path("fixtures/synthetic_logs").glob("*.log")):
+        lines = load_and_normalize(str(fixture_path))
+        segments = build_segments(lines, detect_phases(lines))
+
+        combined = run_rules(lines, segments, rules, use_prefilter=True)
+        python_only = run_rules(lines, segments, rules, use_prefilter=False)
+
+        assert combined == python_only, fixture_path.name
+
+    from triage.normalize import NormalizedLine
+
+    # Literal-free rules go through the combined regex; "(?P<" here is escaped text, not a group.
+    tricky = compile_rules(
+        {
+            "rules": [
+                {"id": "R1", "category": "c", "severity": "low", "confidence": 0.5, "regex": r"(?:ZZ|\(?P<a>)\d"},
+                {"id": "R2", "category": "c2", "severity": "low", "confidence": 0.5, "regex": r"[(?P<b>]\d"},
+            ]
+        }
+    )
+    texts = ["P<a>1", "(P<a>2", "ZZ3", "<4", "none"]
+    lines = [NormalizedLine(idx=index, raw=text, text=text) for index, text in enumerate(texts, start=1)]
+    combined = run_rules(lines, [], tricky, use_prefilter=True)
+    assert len(combined) == 6
+    assert combined == run_rules(lines, [], tricky, use_prefilter=False)
+
+
+def test_run_rules_workers_match_in_process_scan(monkeypatch) -> None:
+    from triage.normalize import load_and_normalize
+    from triage.phases import build_segments, detect_phases
+    from triage.rules import engine
+    from triage.rules.loader import load_rulepack
+
+    rules = []
+    for rulepack_path in sorted(Path("src/triage/rulepacks").glob("*.yaml")):
+        rules.extend(engine.compile_rules(load_rulepack(str(rulepack_path))))
+    lines = load_and_normalize("fixtures/synthetic_logs/repeats_minimal.log")
+    segments = build_segments(lines, detect_phases(lines))
+
+    in_process = engine.run_rules(lines, segments, rules)
+    monkeypatch.setattr(engine, "_PARALLEL_MIN_LINES", 0)
+    monkeypatch.setattr(engine, "_PARALLEL_CHUNK_LINES", 2)
+    parallel = engine.run_rules(lines, segments, rules, workers=2)
+
+    assert in_process
+    assert parallel == in_process
+
+
+def test_prefilter_keeps_backreference_rules_unfiltered() -> None:
+    from triage.rules.engine import build_prefilter, compile_rules
+
+    rules = compile_rules(
+        {
+            "rules": [
+                {"id": "R1", "category": "c", "severity": "low", "confidence": 0.5, "regex": "(?i)fail"},
+                {"id": "R2", "category": "c", "severity": "low", "confidence": 0.5, "regex": r"(?P<w>\w+) (?P=w)"},
+            ]
+        }
+    )
+
+    prefilter, unfiltered = build_prefilter(rules)
+
+    assert prefilter is not None
+    assert prefilter.search("FAIL here")
+    assert [rule.id for rule in unfiltered] == ["R2"]
+
+
+def test_rule_literals_are_derived_or_declared() -> None:
+    from triage.rules.engine import compile_rules
+
+    rules = compile_rules(
+        {
+            "rules": [
+                {"id": "R1", "category": "c", "severity": "low", "confidence": 0.5, "regex": r"(?i)\bPCIe (?:link down|retrain)\b"},
+                {"id": "R2", "category": "c", "severity": "low", "confidence": 0.5, "regex": r"(?i)[0-9a-f]{2}:\d+"},
+                {"id": "R3", "category": "c", "severity": "low", "confidence": 0.5, "regex": "(?i)x+", "prefilter": ["XY", "z"]},
+            ]
+        }
+    )
+
+    assert rules[0].literals == ("link down", "retrain")
+    assert rules[1].literals == ()
+    assert rules[2].literals == ("xy", "z")
+
+
+def test_rule_literal_gate_keeps_unicode_case_matches() -> None:
+    from triage.normalize import NormalizedLine
+    from triage.rules.engine import compile_rules, run_rules
+
+    rules = compile_rules(
+        {"rules": [{"id": "R1", "category": "c", "severity": "low", "confidence": 0.5, "regex": "(?i)kill switch"}]}
+    )
+    # U+212A KELVIN SIGN matches "k" under re.IGNORECASE but is not ASCII.
+    lines = [
+        NormalizedLine(idx=1, raw="\u212aill switch engaged", text="\u212aill switch engaged"),
+        NormalizedLine(idx=2, raw="nothing", text="nothing"),
+    ]
+
+    assert len(run_rules(lines, [], rules, use_prefilter=True)) == 1
+    assert run_rules(lines, [], rules, use_prefilter=True) == run_rules(lines, [], rules, use_prefilter=False)
+
+
+def test_literal_dispatch_keeps_rule_order_and_literal_free_rules() -> None:
+    from triage.normalize import NormalizedLine
+    from triage.rules.engine import compile_rules, run_rules
+
+    rules = compile_rules(
+        {
+            "rules": [
+                {"id": "R1", "category": "c1", "severity": "low", "confidence": 0.5, "regex": r"(?i)[0-9a-f]{2}:\d+"},
+                {"id": "R2", "category": "c2", "severity": "low", "confidence": 0.5, "regex": "Timeout"},
+                {"id": "R3", "category": "c3", "severity": "low", "confidence": 0.5, "regex": r"(?P<w>\w+) (?P=w)"},
+                {"id": "R4", "category": "c4", "severity": "low", "confidence": 0.5, "regex": "(?i)timeout|hang"},
+            ]
+        }
+    )
+    texts = ["TIMEOUT at 0A:12", "Timeout Timeout", "hang", "timeout", "quiet line"]
+    lines = [NormalizedLine(idx=index, raw=text, text=text) for index, text in enumerate(texts, start=1)]
+
+    events = run_rules(lines, [], rules, use_prefilter=True)
+
+    assert [(event["rule_hits"][0]["rule_id"], event["where"]["line_range"]["start"]) for event in events] == [
+        ("R1", 1),
+        ("R4", 1),
+        ("R2", 2),
+        ("R3", 2),
+        ("R4", 2),
+        ("R4", 3),
+        ("R4", 4),
+    ]
+    assert events == run_rules(lines, [], rules, use_prefilter=False)
+
+
+def test_matcher_only_offers_rules_for_the_line_phase() -> None:
+    from triage.rules.engine import _match_lines, _matcher_state, compile_rules
+
+    rules = compile_rules(
+        {
+            "rules": [
+                {"id": "R1", "category": "c", "severity": "low", "confidence": 0.5, "regex": "fail", "required_phase": "PEI"},
+                {"id": "R2", "category": "c", "severity": "low", "confidence": 0.5, "regex": "fail"},
+                {"id": "R3", "category": "c", "severity": "low", "confidence": 0.5, "regex": "fail", "required_phase": "DXE"},
+            ]
+        }
+    )
+    entries = [(0, "fail", "PEI"), (1, "fail", "DXE"), (2, "fail", "BDS"), (3, "fail", None)]
+
+    for use_prefilter in (True, False):
+        hits = _match_lines(entries, _matcher_state(rules, use_prefilter))
+        assert [(position, rule_index) for position, rule_index, _ in hits] == [(0, 0), (0, 1), (1, 1), (1, 2), (2, 1), (3, 1)]
+
+
+def test_load_rulepack_json_fallback_reads_bytes(monkeypatch) -> None:
+    import sys
+
+    from triage.rules.loader import load_rulepack
+
+    with_yaml = load_rulepack("src/triage/rulepacks/faults_v1.yaml")
+    monkeypatch.setitem(sys.modules, "yaml", None)
+
+    assert load_rulepack("src/triage/rulepacks/faults_v1.yaml") == with_yaml
+
+
+def test_line_location_table_matches_first_containing_segment_and_span() -> None:
+    from triage.phases import PhaseSpan, Segment
+    from triage.rules.engine import _line_location_table
+
+    segments = [
+        Segment("seg-1", 2, 6, [PhaseSpan("SEC", 1, 3, 0.9), PhaseSpan("PEI", 3, 9, 0.9)]),
+        Segment("seg-2", 5, 10, [PhaseSpan("DXE", 8, 8, 0.9)]),
+    ]
+
+    def reference(line_no: int) -> tuple[str | None, str | None]:
+        for segment in segments:
+            if segment.start_line <= line_no <= segment.end_line:
+                phase = next((span.phase for span in segment.phases if span.start_line <= line_no <= span.end_line), None)
+                return segment.segment_id, phase
+        return None, None
+
+    table = _line_location_table(segments)
+    assert [table[line_no] for line_no in range(1, 11)] == [reference(line_no) for line_no in range(1, 11)]
+    assert len(table) == 11
+
+
+def test_compile_rules_precomputes_group_and_bdf_flags() -> None:
+    from triage.rules.engine import compile_rules
+
+    base = {"category": "pcie.enum", "severity": "high", "base_confidence": 0.8}
+    plain, grouped, aliased = compile_rules(
+        {
+            "rules": [
+                {**base, "id": "plain", "regex": r"link down"},
+                {**base, "id": "grouped", "regex": r"device (?P<bdf>[0-9a-f:.]+) missing"},
+                {**base, "id": "aliased", "regex": r"port (?P<port>\d+) fail", "extracts": {"bdf": "{port}"}},
+            ]
+        }
+    )
+
+    assert (plain.has_named_groups, plain.needs_bdf_norm) == (False, False)
+    assert (grouped.has_named_groups, grouped.needs_bdf_norm) == (True, True)
+    assert (aliased.has_named_groups, aliased.needs_bdf_norm) == (True, True)
+
+
+def test_rule_extract_templates_resolve_like_str_format() -> None:
+    from triage.normalize import NormalizedLine
+    from triage.rules.engine import compile_rules, run_rules
+
+    rules = compile_rules(
+        {
+            "rules": [
+                {
+                    "id": "R_TPL",
+                    "category": "storage.nvme",
+                    "severity": "high",
+                    "base_confidence": 0.8,
+                    "regex": r"nvme(?P<ctrl>\d+) timeout(?: ns(?P<ns>\d+))?",
+                    "extracts": {
+                        "controller": "ctrl",
+                        "device": "nvme{ctrl}",
+                        "namespace": "nvme{ctrl}n{ns}",
+                        "padded": "{ctrl:>3}",
+                        "escaped": "{{raw}}",
+                    },
+                }
+            ]
+        }
+    )
+    text = "nvme1 timeout"
+    events = run_rules([NormalizedLine(idx=1, raw=text, text=text)], [], rules, include_evidence_lines=False)
+
+    assert events[0]["extracted"] == {
+        "ctrl": "1",
+        "controller": "1",
+        "device": "nvme1",
+        "namespace": "nvme{ctrl}n{ns}",
+        "padded": "  1",
+        "escaped": "{raw}",
+    }
@@ -57,3 +57,22 @@ def test_validate_output_accepts_trimming_count_in_evidence_pack_meta() -> None:
     }
 
     validate_output(data)
+
+
+@pytest.mark.parametrize("backend", ["fastjsonschema", "jsonschema"])
+def test_validate_output_backends_agree_on_error_path(monkeypatch, backend: str) -> None:
+    from triage.schemas import validate
+
+    pytest.importorskip(backend)
+    if backend == "jsonschema":
+        monkeypatch.setattr(validate, "_compiled_validator", lambda: None)
+
+    data = {
+        "schema_version": "0.1.0",
+        "normalization": {"line_count": -1},
+        "events": [],
+        "llm_enabled": False,
+    }
+
+    with pytest.raises(ValueError, match=r"Schema validation failed at normalization\.line_count"):
+        validate_output(data)
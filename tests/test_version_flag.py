@@ -11,3 +11,36 @@ def test_version_flag_prints_version_and_exits_zero(capsys) -> None:
 
     assert exit_code == 0
     assert captured.out.strip() == "0.1.0"
+
+
+def test_bare_version_flag_skips_parser_construction(monkeypatch, capsys) -> None:
+    def _fail() -> None:
+        raise AssertionError("parser should not be built for a bare --version")
+
+    monkeypatch.setattr(cli, "_shared_parser", _fail)
+    monkeypatch.setattr("sys.argv", ["bioslogtriage", "--version"])
+
+    assert cli.main() == 0
+    assert capsys.readouterr().out.strip() == "0.1.0"
+
+
+def test_version_flag_does_not_import_llm_rules_or_schema_modules() -> None:
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    script = (
+        "import sys; from triage import cli; cli.main(['--version']); "
+        "print(sorted(m for m in sys.modules if m.startswith("
+        "('triage.llm', 'triage.rules', 'triage.schemas', 'concurrent.futures'))))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": str(src_dir)},
+    )
+
+    assert result.stdout.splitlines()[-1] == "[]"